@@ -0,0 +1,92 @@
+""" Benchmarks of the mock controllers, without pymodaq"""
+import numpy as np
+
+from pymodaq_plugins_pid.hardware.beamsteering import BeamSteeringController
+from pymodaq_plugins_pid.hardware.boiler_core import BoilerCore, BoilerBankCore, neighbour_coupling
+from pymodaq_plugins_pid.hardware.clock import SteppedClock
+from pymodaq_plugins_pid.hardware.shared_frames import SharedFrameRing
+
+
+class BeamSteeringFrames:
+    params = [64, 256, 1024]
+    param_names = ['size']
+
+    def setup(self, size):
+        self.controller = BeamSteeringController(seed=0)
+        self.controller.set_sensor(size, size)
+
+    def time_set_Mock_data(self, size):
+        self.controller.set_Mock_data()
+
+    def time_get_data_output_0D(self, size):
+        self.controller.get_data_output(data_dim='0D')
+
+    def time_get_data_output_1D(self, size):
+        self.controller.get_data_output(data_dim='1D')
+
+    def time_get_data_output_2D(self, size):
+        self.controller.get_data_output(data_dim='2D')
+
+    def time_get_frame_products(self, size):
+        self.controller.get_frame_products()
+
+
+class BoilerCoreStep:
+
+    def setup(self):
+        self.clock = SteppedClock()
+        self.core = BoilerCore(seed=0, clock=self.clock)
+
+    def time_step(self):
+        self.core.step(0.1)
+
+    def time_grab(self):
+        self.clock.step(0.1)
+        self.core.grab()
+
+
+class BoilerBankStep:
+    params = [1, 16, 128]
+    param_names = ['zones']
+
+    def setup(self, zones):
+        self.clock = SteppedClock()
+        self.bank = BoilerBankCore(zones, seed=0, clock=self.clock)
+        self.coupled = BoilerBankCore(zones, seed=0, clock=self.clock, coupling=neighbour_coupling(zones, 0.1))
+        self.powers = np.linspace(0, 2, zones)
+
+    def time_step(self, zones):
+        self.bank.step(0.1)
+
+    def time_step_coupled(self, zones):
+        self.coupled.step(0.1)
+
+    def time_set_powers(self, zones):
+        self.clock.step(0.1)
+        self.bank.set_powers(self.powers)
+
+
+class SharedFrames:
+    """Frames published into the shared memory ring and read back, in a single process"""
+    params = [64, 256, 1024]
+    param_names = ['size']
+
+    def setup(self, size):
+        self.controller = BeamSteeringController(seed=0)
+        self.controller.set_sensor(size, size)
+        self.controller.start_sharing(period=None)
+        self.controller.publish_frame()
+        self.ring = SharedFrameRing.attach(self.controller.ring.name)
+
+    def teardown(self, size):
+        self.ring.close()
+        self.controller.stop_sharing()
+
+    def time_publish_frame(self, size):
+        self.controller.publish_frame()
+
+    def time_read_latest(self, size):
+        self.ring.read_latest()
+
+    def time_read_latest_copy(self, size):
+        self.ring.read_latest(copy=True)
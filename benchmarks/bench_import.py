@@ -0,0 +1,42 @@
+""" Import time of the plugin packages and modules, each measured in a fresh interpreter"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pymodaq_plugins_pid
+
+SCRIPT = 'from time import perf_counter; start = perf_counter(); import {:}; print(perf_counter() - start)'
+
+
+def get_import_time(module):
+    """ Import module in a fresh interpreter and get the import duration in seconds, None if the import failed"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([str(Path(pymodaq_plugins_pid.__file__).parents[1])] +
+                                        ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+    process = subprocess.run([sys.executable, '-c', SCRIPT.format(module)], capture_output=True, text=True, env=env)
+    if process.returncode != 0:
+        return None
+    return float(process.stdout.strip().splitlines()[-1])
+
+
+class ImportTime:
+    params = ['pymodaq_plugins_pid.hardware.boiler',
+              'pymodaq_plugins_pid.hardware.beamsteering',
+              'pymodaq_plugins_pid.utils.tuning',
+              'pymodaq_plugins_pid.daq_move_plugins',
+              'pymodaq_plugins_pid.daq_viewer_plugins.plugins_0D',
+              'pymodaq_plugins_pid.daq_viewer_plugins.plugins_1D',
+              'pymodaq_plugins_pid.daq_viewer_plugins.plugins_2D',
+              'pymodaq_plugins_pid.daq_move_plugins.daq_move_BeamSteering',
+              'pymodaq_plugins_pid.daq_viewer_plugins.plugins_2D.daq_2Dviewer_BeamSteering',
+              'pymodaq_plugins_pid.models.PIDModelBeamSteering',
+              ]
+    param_names = ['module']
+
+    def setup(self, module):
+        if get_import_time(module) is None:
+            raise NotImplementedError(f'{module} cannot be imported')
+
+    def track_import_time(self, module):
+        return get_import_time(module)
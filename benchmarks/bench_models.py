@@ -0,0 +1,47 @@
+""" Benchmarks of the PID models, skipped if pymodaq is not installed"""
+import numpy as np
+
+from pymodaq_plugins_pid.hardware.beamsteering import BeamSteeringController
+
+
+class BeamSteeringModel:
+    params = [False, True]
+    param_names = ['tracking']
+
+    def setup(self, tracking):
+        try:
+            from pymodaq_data.data import DataToExport, DataRaw
+            from pymodaq_plugins_pid.models.PIDModelBeamSteering import PIDModelBeamSteering
+            from pymodaq_plugins_pid.utils.simulation import PIDControllerStandIn
+        except ImportError:
+            raise NotImplementedError('pymodaq is not installed')
+        self.model = PIDModelBeamSteering(PIDControllerStandIn(PIDModelBeamSteering, dict(tracking=tracking)))
+        image = BeamSteeringController(seed=0).get_data_output(data_dim='2D')
+        self.measurements = DataToExport('Camera', data=[DataRaw('Mock2DPID', data=[image])])
+        self.outputs = [0.1, -0.1]
+        self.model.convert_input(self.measurements)
+
+    def time_convert_input(self, tracking):
+        self.model.convert_input(self.measurements)
+
+    def time_convert_output(self, tracking):
+        self.model.convert_output(self.outputs, 0.1)
+
+
+class BoilerModel:
+
+    def setup(self):
+        try:
+            from pymodaq_data.data import DataToExport, DataRaw
+            from pymodaq_plugins_pid.models.PIDModelBoiler import PIDModelBoiler
+            from pymodaq_plugins_pid.utils.simulation import PIDControllerStandIn
+        except ImportError:
+            raise NotImplementedError('pymodaq is not installed')
+        self.model = PIDModelBoiler(PIDControllerStandIn(PIDModelBoiler))
+        self.measurements = DataToExport('Thermometer', data=[DataRaw('Boiler', data=[np.array([20.])])])
+
+    def time_convert_input(self):
+        self.model.convert_input(self.measurements)
+
+    def time_convert_output(self):
+        self.model.convert_output([0.1], 0.1)
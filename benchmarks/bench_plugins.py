@@ -0,0 +1,73 @@
+""" Benchmarks of the viewer and actuator plugins, skipped if pymodaq is not installed
+
+The plugins are instantiated without DAQ_Viewer/DAQ_Move module: their signals and status emission are replaced by
+no-ops, so the benchmarks measure the plugin code and not the Qt signal delivery.
+"""
+import importlib
+
+VIEWERS = {
+    '0D_BeamSteering': ('plugins_0D.daq_0Dviewer_BeamSteering', 'DAQ_0DViewer_BeamSteering'),
+    '0D_Boiler': ('plugins_0D.daq_0Dviewer_Boiler', 'DAQ_0DViewer_Boiler'),
+    '0D_BoilerBank': ('plugins_0D.daq_0Dviewer_BoilerBank', 'DAQ_0DViewer_BoilerBank'),
+    '1D_BeamSteering': ('plugins_1D.daq_1Dviewer_BeamSteering', 'DAQ_1DViewer_BeamSteering'),
+    '2D_BeamSteering': ('plugins_2D.daq_2Dviewer_BeamSteering', 'DAQ_2DViewer_BeamSteering'),
+    '2D_BeamSteeringAll': ('plugins_2D.daq_2Dviewer_BeamSteeringAll', 'DAQ_2DViewer_BeamSteeringAll'),
+    '2D_BeamSteeringFocused': ('plugins_2D.daq_2Dviewer_BeamSteeringFocused', 'DAQ_2DViewer_BeamSteeringFocused'),
+}
+
+ACTUATORS = {
+    'BeamSteering': ('daq_move_BeamSteering', 'DAQ_Move_BeamSteering'),
+    'Boiler': ('daq_move_Boiler', 'DAQ_Move_Boiler'),
+    'BoilerBank': ('daq_move_BoilerBank', 'DAQ_Move_BoilerBank'),
+}
+
+
+class _Signal:
+    def emit(self, *args):
+        pass
+
+
+def _ignore(*args, **kwargs):
+    pass
+
+
+def get_plugin_class(package, module, name):
+    try:
+        return getattr(importlib.import_module(f'pymodaq_plugins_pid.{package}.{module}'), name)
+    except ImportError:
+        raise NotImplementedError('pymodaq is not installed')
+
+
+class ViewerGrab:
+    params = list(VIEWERS)
+    param_names = ['viewer']
+
+    def setup(self, viewer):
+        self.viewer = get_plugin_class('daq_viewer_plugins', *VIEWERS[viewer])(None, None)
+        self.viewer.data_grabed_signal = _Signal()
+        self.viewer.emit_status = _ignore
+        self.viewer.ini_detector()
+
+    def teardown(self, viewer):
+        self.viewer.close()
+
+    def time_grab_data(self, viewer):
+        self.viewer.grab_data()
+
+
+class ActuatorMove:
+    params = list(ACTUATORS)
+    param_names = ['actuator']
+
+    def setup(self, actuator):
+        self.actuator = get_plugin_class('daq_move_plugins', *ACTUATORS[actuator])(None, None)
+        self.actuator.emit_status = _ignore
+        self.actuator.poll_moving = _ignore
+        self.actuator.ini_stage()
+        self.actuator.current_position = 0.
+
+    def time_move_Abs(self, actuator):
+        self.actuator.move_Abs(1.)
+
+    def time_move_Rel(self, actuator):
+        self.actuator.move_Rel(0.1)
@@ -0,0 +1,98 @@
+""" Check that the light modules of the package do not import heavy dependencies (Qt, scipy, pymodaq, pint)
+
+Each module is imported in a fresh interpreter with python -X importtime, whose report gives every module imported
+and its cumulative import time. Usage, from the repository root:
+
+    python -m benchmarks.check_importtime                  # check the default modules
+    python -m benchmarks.check_importtime --budget 0.2     # also fail if an import takes more than 0.2 s
+    python -m benchmarks.check_importtime -v pymodaq_plugins_pid.utils.tuning
+
+The exit code is 1 if a forbidden module is imported or a budget exceeded.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+modules = ['pymodaq_plugins_pid',
+           'pymodaq_plugins_pid.hardware.clock',
+           'pymodaq_plugins_pid.hardware.boiler_core',
+           'pymodaq_plugins_pid.hardware.boiler',
+           'pymodaq_plugins_pid.hardware.beamsteering',
+           'pymodaq_plugins_pid.hardware.shared_frames',
+           'pymodaq_plugins_pid.utils.simulation',
+           'pymodaq_plugins_pid.utils.tuning',
+           'pymodaq_plugins_pid.utils.instrumentation',
+           'pymodaq_plugins_pid.utils.profiling',
+           'pymodaq_plugins_pid.daq_move_plugins',
+           'pymodaq_plugins_pid.daq_viewer_plugins.plugins_0D',
+           'pymodaq_plugins_pid.daq_viewer_plugins.plugins_1D',
+           'pymodaq_plugins_pid.daq_viewer_plugins.plugins_2D',
+           ]
+forbidden = ['qtpy', 'PyQt5', 'PyQt6', 'PySide2', 'PySide6', 'scipy', 'pymodaq', 'pymodaq_data', 'pymodaq_utils',
+             'pint']
+
+
+def get_import_times(module):
+    """ Import module in a fresh interpreter with -X importtime
+
+    Returns
+    -------
+    dict: cumulative import time in seconds of each imported module, by module name
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([str(ROOT.joinpath('src'))] +
+                                        ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             capture_output=True, text=True, env=env)
+    if process.returncode != 0:
+        raise ImportError(process.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) * 1e-6
+    return times
+
+
+def check(module, budget=None, verbose=False):
+    """ Check the imports of a module
+
+    Returns
+    -------
+    list of str: the problems found, empty if none
+    """
+    try:
+        times = get_import_times(module)
+    except ImportError as e:
+        return [f'{module} cannot be imported: {e}']
+    problems = [f'{module} imports {name}' for name in times if name.split('.')[0] in forbidden]
+    duration = times.get(module, 0.)
+    if budget is not None and duration > budget:
+        problems.append(f'{module} takes {duration * 1e3:.1f} ms to import, above {budget * 1e3:.1f} ms')
+    if verbose:
+        print(f'{module:<60} {duration * 1e3:8.1f} ms {len(times):5d} modules')
+    return problems
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Check the imports of the light pymodaq_plugins_pid modules')
+    parser.add_argument('modules', nargs='*', default=modules)
+    parser.add_argument('--budget', type=float, help='maximum cumulative import time of a module in seconds')
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(args)
+
+    problems = []
+    for module in args.modules:
+        problems.extend(check(module, args.budget, args.verbose))
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
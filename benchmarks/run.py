@@ -0,0 +1,159 @@
+""" Offline runner of the benchmarks (asv style classes with setup and time_* methods in the bench_*.py modules)
+
+time_* methods are timed, track_* methods return the tracked value (for instance a duration measured in another
+process); in both cases a larger value is a regression.
+
+Usage, from the repository root:
+
+    python -m benchmarks.run --save baseline.json          # run and store the results as a baseline
+    python -m benchmarks.run --compare baseline.json       # run and flag the regressions against the baseline
+    python -m benchmarks.run -k BeamSteering --threshold 0.1
+
+A benchmark whose setup raises NotImplementedError (for instance pymodaq not installed) is skipped. In compare
+mode, the exit code is 1 if any benchmark is slower than the baseline by more than the threshold.
+"""
+import argparse
+import importlib
+import itertools
+import json
+import platform
+import sys
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+try:
+    import pymodaq_plugins_pid  # noqa: F401
+except ImportError:  # running from a checkout without install
+    sys.path.insert(0, str(ROOT.joinpath('src')))
+
+
+def get_benchmarks(pattern=''):
+    """ Collect the benchmarks as (name, class, method name, parameters) tuples"""
+    benchmarks = []
+    for path in sorted(Path(__file__).parent.glob('bench_*.py')):
+        module = importlib.import_module(f'benchmarks.{path.stem}')
+        for class_name, bench_class in vars(module).items():
+            if not isinstance(bench_class, type) or bench_class.__module__ != module.__name__:
+                continue
+            params = getattr(bench_class, 'params', [])
+            if len(getattr(bench_class, 'param_names', [])) > 1:
+                combinations = list(itertools.product(*params))
+            else:
+                combinations = [(param,) for param in params] or [()]
+            for method in sorted(name for name in dir(bench_class) if name.startswith(('time_', 'track_'))):
+                for combination in combinations:
+                    name = f"{path.stem}.{class_name}.{method}({', '.join(repr(val) for val in combination)})"
+                    if pattern in name:
+                        benchmarks.append((name, bench_class, method, combination))
+    return benchmarks
+
+
+def time_benchmark(bench_class, method, params, repeat=5, min_time=0.05):
+    """ Time a benchmark method (or get the values of a track method)
+
+    The number of calls per repeat is calibrated so that a repeat lasts at least min_time seconds.
+
+    Returns
+    -------
+    dict: min and median duration of a call in seconds, None if the benchmark is skipped
+    """
+    bench = bench_class()
+    try:
+        if hasattr(bench, 'setup'):
+            bench.setup(*params)
+    except NotImplementedError:
+        return None
+    try:
+        func = getattr(bench, method)
+        if method.startswith('track_'):
+            values = [func(*params) for _ in range(repeat)]
+            return dict(min=float(np.min(values)), median=float(np.median(values)), number=1)
+        number = 1
+        while True:
+            start = perf_counter()
+            for _ in range(number):
+                func(*params)
+            duration = perf_counter() - start
+            if duration >= min_time:
+                break
+            number *= 2 if duration == 0 else max(2, int(np.ceil(min_time / duration)))
+        durations = [duration / number]
+        for _ in range(repeat - 1):
+            start = perf_counter()
+            for _ in range(number):
+                func(*params)
+            durations.append((perf_counter() - start) / number)
+    finally:
+        if hasattr(bench, 'teardown'):
+            bench.teardown(*params)
+    return dict(min=float(np.min(durations)), median=float(np.median(durations)), number=number)
+
+
+def run(pattern='', repeat=5, min_time=0.05, verbose=True):
+    results = {}
+    for name, bench_class, method, params in get_benchmarks(pattern):
+        results[name] = time_benchmark(bench_class, method, params, repeat, min_time)
+        if verbose:
+            print(f'{name:<80} ' + ('skipped' if results[name] is None else
+                                    f"{results[name]['median'] * 1e6:12.2f} us"))
+    return dict(meta=dict(date=datetime.now().isoformat(timespec='seconds'), python=platform.python_version(),
+                          numpy=np.__version__, machine=platform.machine(), platform=platform.platform()),
+                results=results)
+
+
+def compare(results, baseline, threshold=0.2):
+    """ Compare the median durations to a baseline
+
+    Returns
+    -------
+    list of str: names of the benchmarks slower than the baseline by more than threshold (relative)
+    """
+    regressions = []
+    for name, result in results['results'].items():
+        reference = baseline['results'].get(name)
+        if result is None or reference is None:
+            continue
+        ratio = result['median'] / reference['median']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = 'REGRESSION'
+            regressions.append(name)
+        elif ratio < 1 / (1 + threshold):
+            flag = 'improved'
+        print(f"{name:<80} {reference['median'] * 1e6:12.2f} us {result['median'] * 1e6:12.2f} us "
+              f"{ratio:6.2f}x {flag}")
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Run the pymodaq_plugins_pid benchmarks')
+    parser.add_argument('-k', '--pattern', default='', help='only run the benchmarks whose name contains pattern')
+    parser.add_argument('--save', help='json file where to store the results')
+    parser.add_argument('--compare', help='json file of baseline results to compare to')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown flagged as a regression (default 0.2)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05, help='minimum duration of a repeat in seconds')
+    args = parser.parse_args(args)
+
+    results = run(args.pattern, args.repeat, args.min_time, verbose=args.compare is None)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f'{len(regressions)} regression(s) above {args.threshold:.0%}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,4 @@
-from pathlib import Path
+import os
 
-with open(str(Path(__file__).parent.joinpath('VERSION')), 'r') as fvers:
+with open(os.path.join(os.path.dirname(__file__), 'VERSION'), 'r') as fvers:
     __version__ = fvers.read().strip()
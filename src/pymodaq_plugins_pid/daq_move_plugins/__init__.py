@@ -1,12 +1,8 @@
-import importlib
-from pathlib import Path
-from pymodaq_utils.logger import set_logger
-logger = set_logger('move_plugins', add_to_console=False)
+from pymodaq_plugins_pid.utils.lazy_import import lazy_plugin_loader
 
-for path in Path(__file__).parent.iterdir():
-    try:
-        if '__init__' not in str(path):
-            importlib.import_module('.' + path.stem, __package__)
-    except Exception as e:
-        logger.warning("{:} plugin couldn't be loaded due to some missing packages or errors: {:}".format(path.stem, str(e)))
-        pass
+# plugin module: plugin class, the modules are only imported when requested
+plugins = {'daq_move_BeamSteering': 'DAQ_Move_BeamSteering',
+           'daq_move_Boiler': 'DAQ_Move_Boiler',
+           'daq_move_BoilerBank': 'DAQ_Move_BoilerBank'}
+
+__getattr__, __dir__ = lazy_plugin_loader(__name__, plugins, 'move_plugins')
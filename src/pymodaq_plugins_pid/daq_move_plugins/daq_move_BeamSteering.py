@@ -5,6 +5,8 @@ from pymodaq_utils.utils import ThreadCommand, getLineInfo
 # object used to send info back to the main thread
 from easydict import EasyDict as edict  # type of dict
 from pymodaq_plugins_pid.hardware.beamsteering import BeamSteeringController
+from pymodaq_plugins_pid.utils.instrumentation import instrumented
+from pymodaq_plugins_pid.utils.profiling import PluginProfiler, get_profile_params
 
 class DAQ_Move_BeamSteering(DAQ_Move_base):
     """
@@ -21,10 +23,11 @@ class DAQ_Move_BeamSteering(DAQ_Move_base):
     _axis_names: Union[List[str], Dict[str, int]] = ['H', 'V']
     _epsilon = 1
 
-    params = comon_parameters_fun(axis_names=_axis_names)
+    params = [get_profile_params()] + comon_parameters_fun(axis_names=_axis_names)
 
     def __init__(self, parent=None, params_state=None):
         super().__init__(parent, params_state)
+        self.profiler = PluginProfiler(self, ['move_Abs', 'move_Rel'], self.settings.child('profile'))
 
     def check_position(self):
         """
@@ -48,9 +51,9 @@ class DAQ_Move_BeamSteering(DAQ_Move_base):
 
     def close(self):
         """
-          not implemented.
+          Stop the profiling if any
         """
-        pass
+        self.profiler.stop()
 
     def commit_settings(self, param):
         """
@@ -60,7 +63,8 @@ class DAQ_Move_BeamSteering(DAQ_Move_base):
 
         """
 
-        pass
+        if param.parent() is not None and param.parent().name() == 'profile':
+            self.profiler.update()
 
     def ini_stage(self, controller=None):
         """
@@ -109,6 +113,7 @@ class DAQ_Move_BeamSteering(DAQ_Move_base):
             self.status.initialized = False
             return self.status
 
+    @instrumented()
     def move_Abs(self, position):
         """
             Make the absolute move from the given position after thread command signal was received in DAQ_Move_main.
@@ -131,6 +136,7 @@ class DAQ_Move_BeamSteering(DAQ_Move_base):
         self.controller.move_abs(self.target_position, self.settings.child('multiaxes', 'axis').value())
 
 
+    @instrumented()
     def move_Rel(self, position):
         """
             Make the relative move from the given position after thread command signal was received in DAQ_Move_main.
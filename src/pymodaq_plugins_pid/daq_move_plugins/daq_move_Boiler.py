@@ -4,6 +4,8 @@ from pymodaq.control_modules.move_utility_classes import DAQ_Move_base, \
 from pymodaq_utils.utils import ThreadCommand, getLineInfo  # object used to send info back to the main thread
 from easydict import EasyDict as edict  # type of dict
 from pymodaq_plugins_pid.hardware.boiler import BoilerController
+from pymodaq_plugins_pid.utils.instrumentation import instrumented
+from pymodaq_plugins_pid.utils.profiling import PluginProfiler, get_profile_params
 
 class DAQ_Move_Boiler(DAQ_Move_base):
     """
@@ -27,11 +29,13 @@ class DAQ_Move_Boiler(DAQ_Move_base):
                   {'title': 'Status:', 'name': 'multi_status', 'type': 'list', 'value': 'Master',
                    'limits': ['Master', 'Slave']},
                   {'title': 'Axis:', 'name': 'axis', 'type': 'list', 'limits': stage_names},
-              ]}] + comon_parameters_fun(is_multiaxes,
+              ]},
+              get_profile_params()] + comon_parameters_fun(is_multiaxes,
                                          epsilon=_epsilon)
 
     def __init__(self, parent=None, params_state=None):
         super().__init__(parent, params_state)
+        self.profiler = PluginProfiler(self, ['move_Abs', 'move_Rel'], self.settings.child('profile'))
 
     def check_position(self):
         """
@@ -51,8 +55,15 @@ class DAQ_Move_Boiler(DAQ_Move_base):
         self.emit_status(ThreadCommand('check_position', [pos]))
         return pos
 
+    def close(self):
+        """
+          Stop the profiling if any
+        """
+        self.profiler.stop()
+
     def commit_settings(self, param):
-        pass
+        if param.parent() is not None and param.parent().name() == 'profile':
+            self.profiler.update()
 
     def ini_stage(self, controller=None):
         """
@@ -108,6 +119,7 @@ class DAQ_Move_Boiler(DAQ_Move_base):
             self.status.initialized = False
             return self.status
 
+    @instrumented()
     def move_Abs(self, position):
         """
             Make the absolute move from the given position after thread command signal was received in DAQ_Move_main.
@@ -129,6 +141,7 @@ class DAQ_Move_Boiler(DAQ_Move_base):
         self.target_position = position
         self.controller.move_abs(self.target_position)
 
+    @instrumented()
     def move_Rel(self, position):
         """
             Make the relative move from the given position after thread command signal was received in DAQ_Move_main.
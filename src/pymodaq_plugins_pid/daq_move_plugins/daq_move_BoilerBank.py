@@ -0,0 +1,142 @@
+from typing import Union, List, Dict
+from pymodaq.control_modules.move_utility_classes import DAQ_Move_base, \
+    comon_parameters_fun
+from pymodaq_utils.utils import ThreadCommand, getLineInfo  # object used to send info back to the main thread
+from easydict import EasyDict as edict  # type of dict
+from pymodaq_plugins_pid.hardware.boiler import BoilerBankController
+from pymodaq_plugins_pid.hardware.boiler_core import BoilerBankCore
+from pymodaq_plugins_pid.utils.instrumentation import instrumented
+from pymodaq_plugins_pid.utils.profiling import PluginProfiler, get_profile_params
+
+
+class DAQ_Move_BoilerBank(DAQ_Move_base):
+    """
+        Heaters of a bank of boiler zones, one axis per zone
+
+        =============== ==============
+        **Attributes**    **Type**
+        *params*          dictionnary
+        =============== ==============
+    """
+    _controller_units = 'W'
+    is_multiaxes = True
+    _axis_names: Union[List[str], Dict[str, int]] = BoilerBankCore.get_zone_names(8)
+    _epsilon: Union[float, List[float]] = 0.1
+
+    params = [{'title': 'Zones:', 'name': 'n_zones', 'type': 'int', 'value': 8, 'min': 1,
+               'tip': 'Number of zones of the controller, applied at initialization'},
+              get_profile_params(),
+              ] + comon_parameters_fun(axis_names=_axis_names, epsilon=_epsilon)
+
+    def __init__(self, parent=None, params_state=None):
+        super().__init__(parent, params_state)
+        self.profiler = PluginProfiler(self, ['move_Abs', 'move_Rel'], self.settings.child('profile'))
+
+    def check_position(self):
+        """
+            Get the current position from the hardware with scaling conversion.
+
+            Returns
+            -------
+            float
+                The position obtained after scaling conversion.
+        """
+        pos = self.controller.check_position(self.settings.child('multiaxes', 'axis').value())
+        self.current_position = pos
+        self.emit_status(ThreadCommand('check_position', [pos]))
+        return pos
+
+    def close(self):
+        """
+          Stop the profiling if any
+        """
+        self.profiler.stop()
+
+    def commit_settings(self, param):
+        if param.parent() is not None and param.parent().name() == 'profile':
+            self.profiler.update()
+
+    def ini_stage(self, controller=None):
+        """
+            Initialize the controller and set the axis limits to its zone names
+
+            ============== ================================================ ==========================================================================================
+            **Parameters**  **Type**                                         **Description**
+
+            *controller*    instance of the specific controller object       If defined this hardware will use it and will not initialize its own controller instance
+            ============== ================================================ ==========================================================================================
+
+            Returns
+            -------
+            Easydict
+                dictionnary containing keys:
+                 * *info* : string displaying various info
+                 * *controller*: instance of the controller object in order to control other axes without the need to init the same controller twice
+                 * *stage*: instance of the stage (axis or whatever) object
+                 * *initialized*: boolean indicating if initialization has been done corretly
+        """
+        try:
+            self.status.update(edict(info="", controller=None, initialized=False))
+
+            if self.is_master:
+                self.controller = BoilerBankController(n_zones=self.settings.child('n_zones').value())
+            else:
+                self.controller = controller
+
+            self.settings.child('n_zones').setValue(len(self.controller.zone_names))
+            self.settings.child('multiaxes', 'axis').setLimits(self.controller.zone_names)
+
+            info = "Boiler bank controller initialized"
+            self.status.info = info
+            self.status.controller = self.controller
+            self.status.initialized = True
+            return self.status
+
+        except Exception as e:
+            self.emit_status(ThreadCommand('Update_Status', [getLineInfo() + str(e), 'log']))
+            self.status.info = getLineInfo() + str(e)
+            self.status.initialized = False
+            return self.status
+
+    @instrumented()
+    def move_Abs(self, position):
+        """
+            Set the heater power of the selected zone
+
+            =============== ========= =======================
+            **Parameters**  **Type**   **Description**
+
+            *position*       float     The absolute position
+            =============== ========= =======================
+        """
+        position = self.check_bound(position)
+        self.target_position = position
+        self.controller.move_abs(self.target_position, self.settings.child('multiaxes', 'axis').value())
+
+    @instrumented()
+    def move_Rel(self, position):
+        """
+            Change the heater power of the selected zone
+
+            =============== ========= =======================
+            **Parameters**  **Type**   **Description**
+
+            *position*       float     The relative position
+            =============== ========= =======================
+        """
+        position = self.check_bound(self.current_position + position) - self.current_position
+        self.target_position = position + self.current_position
+
+        self.controller.move_rel(position, self.settings.child('multiaxes', 'axis').value())
+
+    def move_Home(self):
+        """
+          Send the update status thread command.
+        """
+        self.emit_status(ThreadCommand('Update_Status', ['Move Home not implemented']))
+
+    def stop_motion(self):
+        """
+          Call the specific move_done function (depending on the hardware).
+        """
+        self.move_done()
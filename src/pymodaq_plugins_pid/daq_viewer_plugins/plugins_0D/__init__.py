@@ -1,12 +1,8 @@
-import importlib
-from pathlib import Path
-from pymodaq_utils.logger import set_logger
-logger = set_logger('viewer0D_plugins', add_to_console=False)
+from pymodaq_plugins_pid.utils.lazy_import import lazy_plugin_loader
 
-for path in Path(__file__).parent.iterdir():
-    try:
-        if '__init__' not in str(path):
-            importlib.import_module('.' + path.stem, __package__)
-    except Exception as e:
-        logger.warning("{:} plugin couldn't be loaded due to some missing packages or errors: {:}".format(path.stem, str(e)))
-        pass
+# plugin module: plugin class, the modules are only imported when requested
+plugins = {'daq_0Dviewer_BeamSteering': 'DAQ_0DViewer_BeamSteering',
+           'daq_0Dviewer_Boiler': 'DAQ_0DViewer_Boiler',
+           'daq_0Dviewer_BoilerBank': 'DAQ_0DViewer_BoilerBank'}
+
+__getattr__, __dir__ = lazy_plugin_loader(__name__, plugins, 'viewer0D_plugins')
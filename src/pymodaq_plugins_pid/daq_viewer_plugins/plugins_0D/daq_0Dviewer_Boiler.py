@@ -1,14 +1,12 @@
-from qtpy import QtWidgets
-from qtpy.QtCore import Signal, QThread
 from pymodaq_utils.utils import ThreadCommand, getLineInfo
-from pymodaq_utils.math_utils import gauss1D
 from pymodaq.utils.data import DataFromPlugins
 import numpy as np
 from pymodaq.control_modules.viewer_utility_classes import DAQ_Viewer_base
 from easydict import EasyDict as edict
-from collections import OrderedDict
 from pymodaq.control_modules.viewer_utility_classes import comon_parameters
 from pymodaq_plugins_pid.hardware.boiler import BoilerController
+from pymodaq_plugins_pid.utils.instrumentation import instrumented
+from pymodaq_plugins_pid.utils.profiling import PluginProfiler, get_profile_params
 
 class DAQ_0DViewer_Boiler(DAQ_Viewer_base):
     """
@@ -22,13 +20,17 @@ class DAQ_0DViewer_Boiler(DAQ_Viewer_base):
     params = comon_parameters +\
              [{'title:': 'Noise', 'name': 'noise', 'type': 'float', 'value': BoilerController._noise},
               {'title:': 'Ambiant temp', 'name': 'ambiant_temp', 'type': 'float',
-               'value': BoilerController._ambiant_temperature}
+               'value': BoilerController._ambiant_temperature},
+              {'title': 'Seed:', 'name': 'seed', 'type': 'int', 'value': -1, 'min': -1,
+               'tip': 'Seed of the noise generator, -1 for a random seed'},
+              get_profile_params(),
               ]
 
 
     def __init__(self, parent=None,
                  params_state=None):  # init_params is a list of tuple where each tuple contains info on a 1D channel (Ntps,amplitude, width, position and noise)
         super().__init__(parent, params_state)
+        self.profiler = PluginProfiler(self, ['grab_data'], self.settings.child('profile'))
         self.ind_data = 0
 
     def commit_settings(self, param):
@@ -48,6 +50,10 @@ class DAQ_0DViewer_Boiler(DAQ_Viewer_base):
             self.controller.noise = param.value()
         elif param.name() == 'ambiant_temp':
             self.controller.ambiant_temp = param.value()
+        elif param.name() == 'seed':
+            self.controller.noise_generator.seed(param.value() if param.value() >= 0 else None)
+        elif param.parent() is not None and param.parent().name() == 'profile':
+            self.profiler.update()
 
 
     def ini_detector(self, controller=None):
@@ -71,7 +77,8 @@ class DAQ_0DViewer_Boiler(DAQ_Viewer_base):
             else:
                 self.controller = controller
         else:
-            self.controller = BoilerController()
+            seed = self.settings.child('seed').value()
+            self.controller = BoilerController(seed=seed if seed >= 0 else None)
 
         self.status.initialized = True
         self.status.controller = self.controller
@@ -79,10 +86,11 @@ class DAQ_0DViewer_Boiler(DAQ_Viewer_base):
 
     def close(self):
         """
-            not implemented.
+            Stop the profiling if any
         """
-        pass
+        self.profiler.stop()
 
+    @instrumented(offset=1)
     def grab_data(self, Naverage=1, **kwargs):
         """
             | Start new acquisition.
@@ -0,0 +1,115 @@
+from pymodaq_utils.utils import ThreadCommand, getLineInfo
+from pymodaq.utils.data import DataFromPlugins
+from pymodaq.control_modules.viewer_utility_classes import DAQ_Viewer_base
+from easydict import EasyDict as edict
+from pymodaq.control_modules.viewer_utility_classes import comon_parameters
+from pymodaq_plugins_pid.hardware.boiler import BoilerBankController
+from pymodaq_plugins_pid.utils.instrumentation import instrumented
+from pymodaq_plugins_pid.utils.profiling import PluginProfiler, get_profile_params
+
+
+class DAQ_0DViewer_BoilerBank(DAQ_Viewer_base):
+    """
+        Thermometers of a bank of boiler zones, all the temperatures are emitted as the channels of a single data
+
+        =============== =================
+        **Attributes**  **Type**
+        *params*        dictionnary list
+        =============== =================
+    """
+    params = comon_parameters +\
+             [{'title': 'Zones:', 'name': 'n_zones', 'type': 'int', 'value': 8, 'min': 1,
+               'tip': 'Number of zones, applied at initialization'},
+              {'title': 'Coupling:', 'name': 'coupling', 'type': 'float', 'value': 0., 'min': 0.,
+               'tip': 'Heat exchange rate (1/s) between neighbouring zones'},
+              {'title': 'Noise:', 'name': 'noise', 'type': 'float', 'value': BoilerBankController._noise},
+              {'title': 'Ambiant temp:', 'name': 'ambiant_temp', 'type': 'float',
+               'value': BoilerBankController._ambiant_temperature},
+              {'title': 'Seed:', 'name': 'seed', 'type': 'int', 'value': -1, 'min': -1,
+               'tip': 'Seed of the noise generator, -1 for a random seed'},
+              get_profile_params(),
+              ]
+
+    def __init__(self, parent=None, params_state=None):
+        super().__init__(parent, params_state)
+        self.profiler = PluginProfiler(self, ['grab_data'], self.settings.child('profile'))
+
+    def commit_settings(self, param):
+        """
+            Activate parameters changes on the controller.
+
+            =============== ================================ ===========================
+            **Parameters**   **Type**                          **Description**
+            *param*          instance of pyqtgraph Parameter   the parameter to activate
+            =============== ================================ ===========================
+        """
+        if param.name() == 'coupling':
+            self.controller.set_coupling(param.value())
+        elif param.name() == 'noise':
+            self.controller.noise = param.value()
+        elif param.name() == 'ambiant_temp':
+            self.controller.ambiant_temp = param.value()
+        elif param.name() == 'seed':
+            self.controller.noise_generator.seed(param.value() if param.value() >= 0 else None)
+        elif param.parent() is not None and param.parent().name() == 'profile':
+            self.profiler.update()
+
+    def ini_detector(self, controller=None):
+        """
+            Initialisation procedure of the detector.
+
+            Returns
+            -------
+            edict
+                the initialized status.
+        """
+        self.status.update(edict(initialized=False, info="", x_axis=None, y_axis=None, controller=None))
+        try:
+            if self.settings.child(('controller_status')).value() == "Slave":
+                if controller is None:
+                    raise Exception('no controller has been defined externally while this detector is a slave one')
+                else:
+                    self.controller = controller
+            else:
+                seed = self.settings.child('seed').value()
+                self.controller = BoilerBankController(n_zones=self.settings.child('n_zones').value(),
+                                                       seed=seed if seed >= 0 else None,
+                                                       coupling=self.settings.child('coupling').value())
+                for name in ['noise', 'ambiant_temp']:
+                    self.commit_settings(self.settings.child(name))
+            self.settings.child('n_zones').setValue(len(self.controller.zone_names))
+
+            self.status.initialized = True
+            self.status.controller = self.controller
+            return self.status
+
+        except Exception as e:
+            self.emit_status(ThreadCommand('Update_Status', [getLineInfo() + str(e), 'log']))
+            self.status.info = getLineInfo() + str(e)
+            self.status.initialized = False
+            return self.status
+
+    def close(self):
+        """
+            Stop the profiling if any
+        """
+        self.profiler.stop()
+
+    @instrumented(offset=1)
+    def grab_data(self, Naverage=1, **kwargs):
+        """
+            Grab the temperatures of all the zones and send them in a single data_grabed_signal
+
+            =============== ======== ===============================================
+            **Parameters**  **Type**  **Description**
+            *Naverage*      int       not used
+            =============== ======== ===============================================
+        """
+        temperatures = self.controller.grab()
+        self.data_grabed_signal.emit([DataFromPlugins(name='BoilerBank',
+                                                      data=[temperatures[ind:ind + 1]
+                                                            for ind in range(len(temperatures))],
+                                                      dim='Data0D', labels=self.controller.zone_names)])
+
+    def stop(self):
+        return ""
@@ -1,15 +1,11 @@
-from qtpy.QtCore import QThread
-from qtpy import QtWidgets
-import numpy as np
 from pymodaq.control_modules.viewer_utility_classes import DAQ_Viewer_base, main
 from easydict import EasyDict as edict
-from collections import OrderedDict
 from pymodaq_utils.utils import ThreadCommand, getLineInfo
-from pymodaq_utils.math_utils import my_moment
-from pymodaq.utils.data import DataFromPlugins, Axis
+from pymodaq.utils.data import DataFromPlugins
 from pymodaq.control_modules.viewer_utility_classes import comon_parameters
 from pymodaq_plugins_pid.hardware.beamsteering import BeamSteeringController
-from scipy.ndimage.measurements import center_of_mass
+from pymodaq_plugins_pid.utils.instrumentation import instrumented
+from pymodaq_plugins_pid.utils.profiling import PluginProfiler, get_profile_params
 
 class DAQ_1DViewer_BeamSteering(DAQ_Viewer_base):
     """
@@ -25,13 +21,14 @@ class DAQ_1DViewer_BeamSteering(DAQ_Viewer_base):
         utility_classes.DAQ_Viewer_base
     """
 
-    params = comon_parameters
+    params = comon_parameters + [get_profile_params()]
 
     def __init__(self, parent=None, params_state=None):
         # init_params is a list of tuple where each tuple contains info on a 1D channel (Ntps,amplitude,
         # width, position and noise)
 
         super().__init__(parent, params_state)
+        self.profiler = PluginProfiler(self, ['grab_data'], self.settings.child('profile'))
 
 
     def commit_settings(self, param):
@@ -47,7 +44,8 @@ class DAQ_1DViewer_BeamSteering(DAQ_Viewer_base):
             --------
             set_Mock_data
         """
-        pass
+        if param.parent() is not None and param.parent().name() == 'profile':
+            self.profiler.update()
 
     def ini_detector(self, controller=None):
         """
@@ -82,10 +80,11 @@ class DAQ_1DViewer_BeamSteering(DAQ_Viewer_base):
 
     def close(self):
         """
-            not implemented.
+            Stop the profiling if any
         """
-        pass
+        self.profiler.stop()
 
+    @instrumented(offset=1)
     def grab_data(self, Naverage=1, **kwargs):
         """
             | For each integer step of naverage range set mock data.
@@ -102,7 +101,7 @@ class DAQ_1DViewer_BeamSteering(DAQ_Viewer_base):
             set_Mock_data
         """
 
-        data = self.controller.get_data_output(data_dim='1D')
+        data = self.controller.get_data_output(data_dim='1D', Naverage=Naverage)
         self.data_grabed_signal.emit([DataFromPlugins(name='Mock1D', data=[data], dim='Data1D'),])
 
 
@@ -1,12 +1,9 @@
-import importlib
-from pathlib import Path
-from pymodaq_utils.logger import set_logger
-logger = set_logger('viewer2D_plugins', add_to_console=False)
+from pymodaq_plugins_pid.utils.lazy_import import lazy_plugin_loader
 
-for path in Path(__file__).parent.iterdir():
-    try:
-        if '__init__' not in str(path):
-            importlib.import_module('.' + path.stem, __package__)
-    except Exception as e:
-        logger.warning("{:} plugin couldn't be loaded due to some missing packages or errors: {:}".format(path.stem, str(e)))
-        pass
+# plugin module: plugin class, the modules are only imported when requested
+plugins = {'daq_2Dviewer_BeamSteering': 'DAQ_2DViewer_BeamSteering',
+           'daq_2Dviewer_BeamSteeringAll': 'DAQ_2DViewer_BeamSteeringAll',
+           'daq_2Dviewer_BeamSteeringFocused': 'DAQ_2DViewer_BeamSteeringFocused',
+           'daq_2Dviewer_BeamSteeringShared': 'DAQ_2DViewer_BeamSteeringShared'}
+
+__getattr__, __dir__ = lazy_plugin_loader(__name__, plugins, 'viewer2D_plugins')
@@ -1,15 +1,11 @@
-from qtpy.QtCore import QThread
-from qtpy import QtWidgets
-import numpy as np
 from pymodaq.control_modules.viewer_utility_classes import DAQ_Viewer_base, main
 from easydict import EasyDict as edict
-from collections import OrderedDict
 from pymodaq_utils.utils import ThreadCommand, getLineInfo
-from pymodaq_utils.math_utils import my_moment
-from pymodaq.utils.data import DataFromPlugins, Axis
+from pymodaq.utils.data import DataFromPlugins
 from pymodaq.control_modules.viewer_utility_classes import comon_parameters
 from pymodaq_plugins_pid.hardware.beamsteering import BeamSteeringController
-from scipy.ndimage.measurements import center_of_mass
+from pymodaq_plugins_pid.utils.instrumentation import instrumented
+from pymodaq_plugins_pid.utils.profiling import PluginProfiler, get_profile_params
 
 class DAQ_2DViewer_BeamSteeringAll(DAQ_Viewer_base):
     """
@@ -33,7 +29,23 @@ class DAQ_2DViewer_BeamSteeringAll(DAQ_Viewer_base):
         {'title': 'x0:', 'name': 'x0', 'type': 'float', 'value': 128, 'visible': False},
         {'title': 'y0:', 'name': 'y0', 'type': 'float', 'value': 128, 'visible': False},
         {'title': 'Threshold', 'name': 'threshold', 'type': 'float', 'value': 4.},
-        {'title': 'Drift', 'name': 'drift', 'type': 'bool', 'value': False}
+        {'title': 'Drift', 'name': 'drift', 'type': 'bool', 'value': False},
+        {'title': 'Seed:', 'name': 'seed', 'type': 'int', 'value': -1, 'min': -1,
+         'tip': 'Seed of the noise generator, -1 for a random seed'},
+        {'title': 'Noise ring:', 'name': 'noise_ring', 'type': 'int', 'value': 0, 'min': 0,
+         'tip': 'Number of pre-generated noise frames cycled with random offsets, 0 to draw each frame'},
+        {'title': 'Batched averaging:', 'name': 'batched_average', 'type': 'bool', 'value': False,
+         'tip': 'Average Naverage noise draws instead of drawing the averaged noise from its reduced variance'},
+        {'title': 'Producer thread:', 'name': 'producer', 'type': 'bool', 'value': False,
+         'tip': 'Render frames in advance in a worker thread'},
+        {'title': 'Queue depth:', 'name': 'queue_depth', 'type': 'int', 'value': 2, 'min': 1},
+        {'title': 'Pixel format:', 'name': 'pixel_format', 'type': 'list', 'value': 'float64',
+         'limits': list(BeamSteeringController.pixel_formats.keys())},
+        {'title': 'Gain:', 'name': 'gain', 'type': 'float', 'value': 1.},
+        {'title': 'Offset:', 'name': 'offset', 'type': 'float', 'value': 0.},
+        {'title': 'Saturation:', 'name': 'saturation', 'type': 'float', 'value': 0., 'min': 0.,
+         'tip': 'Saturation level of the pixels, 0 for the full scale of the pixel format'},
+        get_profile_params(),
     ]
 
     def __init__(self, parent=None, params_state=None):
@@ -41,6 +53,7 @@ class DAQ_2DViewer_BeamSteeringAll(DAQ_Viewer_base):
         # width, position and noise)
 
         super().__init__(parent, params_state)
+        self.profiler = PluginProfiler(self, ['grab_data'], self.settings.child('profile'))
         self.x_axis = None
         self.y_axis = None
         self.live = False
@@ -74,6 +87,23 @@ class DAQ_2DViewer_BeamSteeringAll(DAQ_Viewer_base):
             self.controller.current_positions['V'] = param.value()
         elif param.name() == 'drift':
             self.controller.drift = param.value()
+        elif param.name() == 'seed':
+            self.controller.noise_generator.seed(param.value() if param.value() >= 0 else None)
+            if self.controller.is_producing():  # its noise stream is spawned from the reseeded generator
+                self.controller.start_producer(self.settings.child('queue_depth').value())
+        elif param.name() == 'noise_ring':
+            self.controller.noise_generator.set_ring_size(param.value())
+        elif param.name() in ['producer', 'queue_depth']:
+            if self.settings.child('producer').value():
+                self.controller.start_producer(self.settings.child('queue_depth').value())
+            else:
+                self.controller.stop_producer()
+        elif param.name() in ['pixel_format', 'gain', 'offset', 'batched_average']:
+            setattr(self.controller, param.name(), param.value())
+        elif param.name() == 'saturation':
+            self.controller.saturation = param.value() if param.value() > 0 else None
+        elif param.parent() is not None and param.parent().name() == 'profile':
+            self.profiler.update()
 
     def ini_detector(self, controller=None):
         """
@@ -95,8 +125,14 @@ class DAQ_2DViewer_BeamSteeringAll(DAQ_Viewer_base):
                 self.controller = BeamSteeringController(wh=(self.settings.child('dx').value(),
                                           self.settings.child('dy').value()),
                                           noise=self.settings.child('noise').value(),
-                                          amp=self.settings.child('amp').value()
+                                          amp=self.settings.child('amp').value(),
+                                          seed=self.settings.child('seed').value()
+                                          if self.settings.child('seed').value() >= 0 else None,
+                                          noise_ring=self.settings.child('noise_ring').value(),
                                           )
+                for name in ['pixel_format', 'gain', 'offset', 'saturation', 'batched_average',
+                             'producer']:
+                    self.commit_settings(self.settings.child(name))
 
             self.x_axis = self.controller.get_xaxis()
             self.y_axis = self.controller.get_yaxis()
@@ -115,10 +151,13 @@ class DAQ_2DViewer_BeamSteeringAll(DAQ_Viewer_base):
 
     def close(self):
         """
-            not implemented.
+            Stop the frame producer thread and the profiling if any
         """
-        pass
+        if self.controller is not None:
+            self.controller.stop_producer()
+        self.profiler.stop()
 
+    @instrumented(offset=1)
     def grab_data(self, Naverage=1, **kwargs):
         """
             | For each integer step of naverage range set mock data.
@@ -134,16 +173,11 @@ class DAQ_2DViewer_BeamSteeringAll(DAQ_Viewer_base):
             --------
             set_Mock_data
         """
-        data_2D = self.controller.set_Mock_data()
-        image = self.controller.get_data_output(data=data_2D, data_dim='2D')
+        data_2D, data_1D, data_0D = self.controller.get_frame_products(Naverage=Naverage)
         self.data_grabed_signal.emit([
-            DataFromPlugins(name='Mock2D',
-                            data=[self.controller.get_data_output(data=data_2D, data_dim='2D')], dim='Data2D'),
-            DataFromPlugins(name='Mock1D',
-                            data=[self.controller.get_data_output(data=data_2D, data_dim='1D')], dim='Data1D'),
-            DataFromPlugins(name='Mock0D',
-                            data=[self.controller.get_data_output(data=data_2D, data_dim='0D')],
-                                  dim='Data0D'),])
+            DataFromPlugins(name='Mock2D', data=[data_2D], dim='Data2D'),
+            DataFromPlugins(name='Mock1D', data=[data_1D], dim='Data1D'),
+            DataFromPlugins(name='Mock0D', data=[data_0D], dim='Data0D'),])
 
 
     def stop(self):
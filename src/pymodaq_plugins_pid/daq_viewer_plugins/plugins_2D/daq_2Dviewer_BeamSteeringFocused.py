@@ -1,15 +1,12 @@
-from qtpy.QtCore import QThread
-from qtpy import QtWidgets
-import numpy as np
 from pymodaq.control_modules.viewer_utility_classes import DAQ_Viewer_base, main
 from easydict import EasyDict as edict
-from collections import OrderedDict
+import numpy as np
 from pymodaq_utils.utils import ThreadCommand, getLineInfo
-from pymodaq_utils.math_utils import my_moment
-from pymodaq.utils.data import DataFromPlugins, Axis
+from pymodaq.utils.data import DataFromPlugins
 from pymodaq.control_modules.viewer_utility_classes import comon_parameters
 from pymodaq_plugins_pid.hardware.beamsteering import BeamSteeringController
-from scipy.ndimage.measurements import center_of_mass
+from pymodaq_plugins_pid.utils.instrumentation import instrumented
+from pymodaq_plugins_pid.utils.profiling import PluginProfiler, get_profile_params
 
 class DAQ_2DViewer_BeamSteeringFocused(DAQ_Viewer_base):
     """
@@ -25,13 +22,14 @@ class DAQ_2DViewer_BeamSteeringFocused(DAQ_Viewer_base):
         utility_classes.DAQ_Viewer_base
     """
 
-    params = comon_parameters
+    params = comon_parameters + [get_profile_params()]
 
     def __init__(self, parent=None, params_state=None):
         # init_params is a list of tuple where each tuple contains info on a 1D channel (Ntps,amplitude,
         # width, position and noise)
 
         super().__init__(parent, params_state)
+        self.profiler = PluginProfiler(self, ['grab_data'], self.settings.child('profile'))
         self.x_axis = None
         self.y_axis = None
         self.live = False
@@ -51,7 +49,8 @@ class DAQ_2DViewer_BeamSteeringFocused(DAQ_Viewer_base):
             --------
             set_Mock_data
         """
-        pass
+        if param.parent() is not None and param.parent().name() == 'profile':
+            self.profiler.update()
 
     def ini_detector(self, controller=None):
         """
@@ -89,10 +88,11 @@ class DAQ_2DViewer_BeamSteeringFocused(DAQ_Viewer_base):
 
     def close(self):
         """
-            not implemented.
+            Stop the profiling if any
         """
-        pass
+        self.profiler.stop()
 
+    @instrumented(offset=1)
     def grab_data(self, Naverage=1, **kwargs):
         """
             | For each integer step of naverage range set mock data.
@@ -109,8 +109,10 @@ class DAQ_2DViewer_BeamSteeringFocused(DAQ_Viewer_base):
             set_Mock_data
         """
 
-        image = self.controller.get_data_output(data_dim='2D')
-        self.data_grabed_signal.emit([DataFromPlugins(name='Mock2DPID', data=[image**2], dim='Data2D')])
+        image = self.controller.get_data_output(data_dim='2D', Naverage=Naverage)
+        # squared in float, integer pixel formats would wrap around
+        self.data_grabed_signal.emit([DataFromPlugins(name='Mock2DPID', data=[np.square(image, dtype=float)],
+                                                      dim='Data2D')])
 
     def stop(self):
         return ""
@@ -0,0 +1,131 @@
+from pymodaq.control_modules.viewer_utility_classes import DAQ_Viewer_base, main
+from easydict import EasyDict as edict
+from pymodaq_utils.utils import ThreadCommand, getLineInfo
+from pymodaq.utils.data import DataFromPlugins, Axis
+from pymodaq.control_modules.viewer_utility_classes import comon_parameters
+from pymodaq_plugins_pid.hardware.beamsteering import SharedBeamSteeringClient
+from pymodaq_plugins_pid.utils.instrumentation import instrumented
+from pymodaq_plugins_pid.utils.profiling import PluginProfiler, get_profile_params
+
+class DAQ_2DViewer_BeamSteeringShared(DAQ_Viewer_base):
+    """
+        Camera reading the frames a BeamSteeringController publishes into shared memory from another process (see
+        BeamSteeringController.start_sharing or python -m pymodaq_plugins_pid.hardware.beamsteering)
+
+        =============== ==================
+        **Attributes**   **Type**
+        *params*         dictionnary list
+        *x_axis*         1D numpy array
+        *y_axis*         1D numpy array
+        =============== ==================
+
+        See Also
+        --------
+        utility_classes.DAQ_Viewer_base
+    """
+
+    params = comon_parameters + [
+        {'title': 'Shared memory:', 'name': 'shm_name', 'type': 'str', 'value': 'beam_steering',
+         'tip': 'Name of the shared memory block the frames are published into'},
+        {'title': 'Copy frames:', 'name': 'copy', 'type': 'bool', 'value': True,
+         'tip': 'Copy the frames out of the shared memory. Otherwise the emitted frames wrap the shared memory and are '
+                'overwritten once the ring is full, the frames overwritten before the next grab being counted as '
+                'overruns'},
+        {'title': 'Timeout (s):', 'name': 'timeout', 'type': 'float', 'value': 1., 'min': 0.},
+        get_profile_params(),
+    ]
+
+    def __init__(self, parent=None, params_state=None):
+
+        super().__init__(parent, params_state)
+        self.profiler = PluginProfiler(self, ['grab_data'], self.settings.child('profile'))
+        self.x_axis = None
+        self.y_axis = None
+
+    def commit_settings(self, param):
+        """
+            Activate parameters changes on the hardware.
+
+            =============== ================================ ===========================
+            **Parameters**   **Type**                          **Description**
+            *param*          instance of pyqtgraph Parameter   the parameter to activate
+            =============== ================================ ===========================
+        """
+        if param.name() in ['copy', 'timeout']:
+            setattr(self.controller, param.name(), param.value())
+        elif param.parent() is not None and param.parent().name() == 'profile':
+            self.profiler.update()
+
+    def ini_detector(self, controller=None):
+        """
+            Initialisation procedure of the detector initializing the status dictionnary.
+
+            See Also
+            --------
+            daq_utils.ThreadCommand, get_xaxis, get_yaxis
+        """
+        self.status.update(edict(initialized=False, info="", x_axis=None, y_axis=None, controller=None))
+        try:
+
+            if self.settings.child(('controller_status')).value() == "Slave":
+                if controller is None:
+                    raise Exception('no controller has been defined externally while this detector is a slave one')
+                else:
+                    self.controller = controller
+            else:
+                self.controller = SharedBeamSteeringClient(self.settings.child('shm_name').value(),
+                                                           copy=self.settings.child('copy').value(),
+                                                           timeout=self.settings.child('timeout').value())
+
+            self.x_axis = self.controller.get_xaxis()
+            self.y_axis = self.controller.get_yaxis()
+
+            self.status.x_axis = self.x_axis
+            self.status.y_axis = self.y_axis
+            self.status.initialized = True
+            self.status.controller = self.controller
+            return self.status
+
+        except Exception as e:
+            self.emit_status(ThreadCommand('Update_Status', [getLineInfo() + str(e), 'log']))
+            self.status.info = getLineInfo() + str(e)
+            self.status.initialized = False
+            return self.status
+
+    def close(self):
+        """
+            Detach from the shared memory and stop the profiling if any
+        """
+        if self.controller is not None and self.settings.child(('controller_status')).value() == "Master":
+            self.controller.close()
+        self.profiler.stop()
+
+    @instrumented(offset=1)
+    def grab_data(self, Naverage=1, **kwargs):
+        """
+            | Get the next published frame (the mean of the next Naverage ones) and send the data_grabed_signal
+
+            =============== ======== ===============================================
+            **Parameters**  **Type**  **Description**
+            *Naverage*      int       The number of images to average.
+            =============== ======== ===============================================
+        """
+        image = self.controller.get_frame()
+        if Naverage > 1:
+            image = image.astype(float)
+            for ind in range(Naverage - 1):
+                image += self.controller.get_frame()
+            image /= Naverage
+            self.controller.release()
+        self.x_axis = self.controller.get_xaxis()
+        self.y_axis = self.controller.get_yaxis()
+        self.data_grabed_signal.emit([DataFromPlugins(name='Mock2DPID', data=[image], dim='Data2D',
+                                                      axes=[Axis('y', 'pixels', data=self.y_axis, index=0),
+                                                            Axis('x', 'pixels', data=self.x_axis, index=1)]),])
+
+    def stop(self):
+        return ""
+
+
+if __name__ == '__main__':
+    main(__file__)
@@ -1,5 +1,21 @@
+import queue
+import threading
+from time import perf_counter, sleep
+
 import numpy as np
-from pymodaq_utils.math_utils import gauss2D
+from pymodaq_plugins_pid.hardware.noise import NoiseGenerator
+
+# exponent factor of pymodaq_utils.math_utils.gauss1D for n=1: exp(-2 * log(2) * ((x - x0) / dx) ** 2)
+GAUSS_FACTOR = 2 * np.log(2)
+
+
+def erf(x):
+    """ Vectorized error function (Abramowitz and Stegun 7.1.26, absolute error below 1.5e-7)"""
+    x = np.asarray(x, dtype=float)
+    t = 1 / (1 + 0.3275911 * np.abs(x))
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return np.copysign(1 - poly * np.exp(-x ** 2), x)
+
 
 class BeamSteeringController:
 
@@ -11,8 +27,24 @@ class BeamSteeringController:
     offset_y = 128
     coeff = 0.01
     drift = False
+    drift_rate = (0.1, 0.05)  # beam rest position drift (x, y) in pixels per frame, or per second with a clock
+    roi = None
+    binning = 1
+    binnings = [1, 2, 4, 8]
+    batched_average = False
+
+    # pixel format: (dtype, full scale), integer formats are quantized and saturate at their full scale
+    pixel_formats = {'float64': (np.float64, None),
+                     'float32': (np.float32, None),
+                     'uint8': (np.uint8, 255),
+                     'uint12': (np.uint16, 4095),
+                     'uint16': (np.uint16, 65535)}
+    pixel_format = 'float64'
+    gain = 1.
+    offset = 0.
+    saturation = None
 
-    def __init__(self, positions=None, wh=(10, 50), noise=0.1, amp=10):
+    def __init__(self, positions=None, wh=(10, 50), noise=0.1, amp=10, seed=None, noise_ring=0, clock=None):
         super().__init__()
         if positions is None:
             self.current_positions = dict(zip(self.axis, [0. for ind in range(self.Nactuators)]))
@@ -25,6 +57,52 @@ class BeamSteeringController:
         self.noise = noise
         self.wh = wh
         self.data_mock = None
+        self.noise_generator = NoiseGenerator(seed, ring_size=noise_ring)
+        self.clock = clock
+        self._drift_time = None if clock is None else clock.now()
+
+        self._x_axis = None
+        self._y_axis = None
+        self._rotation = None
+
+        self.frames_produced = 0
+        self.frames_dropped = 0
+        self._producer = None
+        self._producer_stop = threading.Event()
+        self._free_buffers = None
+        self._frames = None
+
+        self.ring = None
+        self._publisher = None
+        self._publisher_stop = threading.Event()
+
+    def set_sensor(self, Nx, Ny):
+        """ Set the sensor size in pixels, the beam rest position is set at the center of the sensor"""
+        self.Nx = int(Nx)
+        self.Ny = int(Ny)
+        self.offset_x = self.Nx / 2
+        self.offset_y = self.Ny / 2
+
+    def set_roi(self, x=None, y=None, width=None, height=None):
+        """ Set the readout region of interest in sensor pixels, the full sensor is read if called without argument"""
+        if x is None:
+            self.roi = None
+        else:
+            self.roi = (x, y, width, height)
+
+    def set_binning(self, binning):
+        if binning not in self.binnings:
+            raise ValueError(f'binning should be one of {self.binnings}')
+        self.binning = binning
+
+    def get_roi(self):
+        """ Get the readout region of interest (x, y, width, height) in sensor pixels clipped to the sensor"""
+        if self.roi is None:
+            return 0, 0, self.Nx, self.Ny
+        x, y, width, height = [int(val) for val in self.roi]
+        x = min(max(x, 0), self.Nx - 1)
+        y = min(max(y, 0), self.Ny - 1)
+        return x, y, min(max(width, 1), self.Nx - x), min(max(height, 1), self.Ny - y)
 
     def check_position(self, axis):
         return self.current_positions[axis]
@@ -35,54 +113,629 @@ class BeamSteeringController:
     def move_rel(self, position, axis):
         self.current_positions[axis] += position
 
+    def _get_axis(self, cached, start, length):
+        """ Get the sensor coordinates of the readout pixels (the center of the bins) reusing the cached axis if the
+        geometry did not change"""
+        key = (start, length, self.binning)
+        if cached is None or cached[0] != key:
+            axis = start + self.binning * np.arange(max(length // self.binning, 1)) + (self.binning - 1) / 2
+            axis.flags.writeable = False
+            cached = (key, axis)
+        return cached
+
     def get_xaxis(self):
-        return np.linspace(0, self.Nx, self.Nx, endpoint=False)
+        x, _, width, _ = self.get_roi()
+        self._x_axis = self._get_axis(self._x_axis, x, width)
+        return self._x_axis[1]
 
     def get_yaxis(self):
-        return np.linspace(0, self.Ny, self.Ny, endpoint=False)
+        _, y, _, height = self.get_roi()
+        self._y_axis = self._get_axis(self._y_axis, y, height)
+        return self._y_axis[1]
+
+    def get_beam_center(self):
+        """Get the current beam position (x0, y0) in pixel coordinates"""
+        return (self.offset_x + self.coeff * self.current_positions['H'],
+                self.offset_y + self.coeff * self.current_positions['V'])
 
-    def set_Mock_data(self):
+    def apply_drift(self):
+        """ Move the beam rest position by drift_rate, once per frame or, if the controller has a clock, over the
+        time elapsed since the last call"""
+        if self.clock is None:
+            if self.drift:
+                self.offset_x += self.drift_rate[0]
+                self.offset_y += self.drift_rate[1]
+            return
+        now = self.clock.now()
+        if self.drift:
+            self.offset_x += self.drift_rate[0] * (now - self._drift_time)
+            self.offset_y += self.drift_rate[1] * (now - self._drift_time)
+        self._drift_time = now
+
+    def set_Mock_data(self, Naverage=1):
         """
+        Synthesize a new frame, averaged Naverage times (taken from the producer thread if it is running and
+        Naverage is 1)
         """
+        if Naverage == 1 and self.is_producing():
+            self.data_mock = self.get_produced_frame()
+            return self.data_mock
         x_axis = self.get_xaxis()
         y_axis = self.get_yaxis()
-        if self.drift:
-            self.offset_x += 0.1
-            self.offset_y += 0.05
-        self.data_mock = self.gauss2D(x_axis, y_axis,
-                                 self.offset_x + self.coeff * self.current_positions['H'],
-                                 self.offset_y + self.coeff * self.current_positions['V'])
+        self.apply_drift()
+        self.data_mock = self.render(x_axis, y_axis, Naverage=Naverage)
         return self.data_mock
 
-    def gauss2D(self, x, y, x0, y0):
-        Nx = len(x) if hasattr(x, '__len__') else 1
-        Ny = len(x) if hasattr(y, '__len__') else 1
-        data = self.amp * gauss2D(x, x0, self.wh[0], y, y0, self.wh[1], 1, self.current_positions['Theta']) +\
-               self.noise * np.random.rand(Nx, Ny)
+    def get_state_key(self):
+        """ Get a snapshot of everything the synthesized frames depend on (but the drift)"""
+        return (tuple(self.current_positions.values()), self.amp, self.noise, tuple(self.wh), self.pixel_format,
+                self.gain, self.offset, self.saturation, self.get_roi(), self.binning)
+
+    def start_producer(self, depth=2):
+        """ Start a worker thread rendering frames in advance into a bounded queue
+
+        Frames rendered before a change of the actuator positions or of the beam/camera settings are dropped when
+        dequeued, their buffers being reused. A frame returned by get_produced_frame belongs to the caller (it can be
+        passed to other threads), a new buffer is allocated in its place. The noise stream of the producer is spawned
+        from noise_generator when started: restart the producer after reseeding.
+
+        Parameters
+        ----------
+        depth: (int) maximum number of frames rendered in advance
+        """
+        self.stop_producer()
+        self.frames_produced = 0
+        self.frames_dropped = 0
+        self._frames = queue.Queue(maxsize=depth)
+        self._free_buffers = queue.Queue()
+        for ind in range(depth + 1):
+            self._free_buffers.put(None)
+        self._producer_stop.clear()
+        self._producer = threading.Thread(target=self._produce, args=(self.noise_generator.spawn(),),
+                                          name='BeamSteeringProducer', daemon=True)
+        self._producer.start()
+
+    def stop_producer(self):
+        if self._producer is not None:
+            self._producer_stop.set()
+            self._producer.join()
+            self._producer = None
+
+    def is_producing(self):
+        return self._producer is not None
+
+    @property
+    def queue_depth(self):
+        """Number of frames rendered in advance and waiting to be dequeued"""
+        return 0 if self._frames is None else self._frames.qsize()
+
+    def _produce(self, noise_generator):
+        while not self._producer_stop.is_set():
+            try:
+                buffer = self._free_buffers.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            key = self.get_state_key()
+            x_axis = self.get_xaxis()
+            y_axis = self.get_yaxis()
+            dtype = self.pixel_formats[self.pixel_format][0]
+            if buffer is None or buffer.shape != (y_axis.size, x_axis.size) or buffer.dtype != dtype:
+                buffer = np.empty((y_axis.size, x_axis.size), dtype=dtype)
+            self.apply_drift()
+            self.render(x_axis, y_axis, out=buffer, noise_generator=noise_generator)
+            self.frames_produced += 1
+            while not self._producer_stop.is_set():
+                try:
+                    self._frames.put((key, buffer), timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def get_produced_frame(self, timeout=1.):
+        """ Dequeue the next frame rendered by the producer thread for the current state
+
+        Stale frames are dropped (and counted in frames_dropped), if no valid frame is available within timeout, the
+        frame is rendered synchronously.
+        """
+        key = self.get_state_key()
+        frame = None
+        while frame is None:
+            try:
+                frame_key, buffer = self._frames.get(timeout=timeout)
+            except queue.Empty:
+                self.apply_drift()
+                return self.render(self.get_xaxis(), self.get_yaxis())
+            if frame_key == key:
+                frame = buffer
+            else:
+                self.frames_dropped += 1
+                self._free_buffers.put(buffer)
+        self._free_buffers.put(None)
+        return frame
+
+    def start_sharing(self, name=None, n_slots=4, period=0.01):
+        """ Publish frames into a shared memory ring read by SharedBeamSteeringClient instances in other processes
+
+        The actuator positions are moved into the shared memory too, so that actuators driven from the other processes
+        (through a client) move the beam. The slots are sized for the full sensor in 8 bytes pixels, the sensor
+        should not be enlarged while sharing.
+
+        Parameters
+        ----------
+        name: (str) name of the shared memory block, a random one if None
+        n_slots: (int) number of frames in the ring
+        period: (float) frames are published every period seconds by a worker thread, or only by explicit calls of
+            publish_frame if None
+
+        Returns
+        -------
+        str: the name of the shared memory block
+        """
+        from pymodaq_plugins_pid.hardware.shared_frames import SharedFrameRing, SharedPositions
+        self.stop_sharing()
+        self.ring = SharedFrameRing.create(name, n_slots, self.Nx * self.Ny * 8)
+        self.current_positions = SharedPositions(self.ring.positions, self.axis, self.current_positions)
+        if period is not None:
+            self._publisher_stop.clear()
+            self._publisher = threading.Thread(target=self._publish, args=(period, self.noise_generator.spawn()),
+                                               name='BeamSteeringPublisher', daemon=True)
+            self._publisher.start()
+        return self.ring.name
+
+    def stop_sharing(self):
+        """Stop publishing frames and destroy the shared memory ring, the positions being kept locally"""
+        if self._publisher is not None:
+            self._publisher_stop.set()
+            self._publisher.join()
+            self._publisher = None
+        if self.ring is not None:
+            self.current_positions = dict(self.current_positions)
+            self.ring.close()
+            self.ring = None
+
+    def is_sharing(self):
+        return self.ring is not None
+
+    def _publish(self, period, noise_generator):
+        while not self._publisher_stop.wait(period):
+            self.publish_frame(noise_generator)
+
+    def publish_frame(self, noise_generator=None):
+        """ Render a frame directly into the next slot of the shared memory ring
+
+        Returns
+        -------
+        int: index of the published frame
+        """
+        x_axis = self.get_xaxis()
+        y_axis = self.get_yaxis()
+        x, y, _, _ = self.get_roi()
+        self.apply_drift()
+        frame = self.ring.begin_write((y_axis.size, x_axis.size), self.pixel_formats[self.pixel_format][0], (x, y),
+                                      self.binning)
+        self.render(x_axis, y_axis, out=frame, noise_generator=noise_generator)
+        return self.ring.end_write()
+
+    def get_compute_dtype(self):
+        """Floating point dtype used to synthesize frames in the current pixel format"""
+        return np.float64 if self.pixel_formats[self.pixel_format][0] == np.float64 else np.float32
+
+    def render(self, x, y, out=None, Naverage=1, noise_generator=None):
+        """ Synthesize a noisy frame in the current pixel format
+
+        The gain is folded into the beam amplitude and the noise level, the offset is added with the noise, so that
+        the conversion to the pixel format (clipping at the saturation level and casting) is a single pass. Binned
+        pixels sum the signal of the sensor pixels they cover but get a single noise draw, as for hardware binning.
+
+        As the beam is the same for all frames between two moves, an average of Naverage frames only averages the
+        noise: either from a single batch of draws (batched_average) or directly from its reduced statistics. An
+        averaged frame is not quantized and is returned in floating point (clipped at the saturation level).
+
+        Parameters
+        ----------
+        x: (ndarray) x axis of the frame
+        y: (ndarray) y axis of the frame
+        out: (ndarray) optional array of shape (len(y), len(x)) and of the pixel format dtype to write into
+        Naverage: (int) number of averaged frames
+        noise_generator: (NoiseGenerator) generator to draw the noise from, defaults to the noise_generator attribute
+
+        Returns
+        -------
+        ndarray
+        """
+        dtype, full_scale = self.pixel_formats[self.pixel_format]
+        compute_dtype = self.get_compute_dtype()
+        if noise_generator is None:
+            noise_generator = self.noise_generator
+        noise_generator.set_dtype(compute_dtype)
+        data = self.synthesize(x, y, *self.get_beam_center(), amp=self.amp * self.gain, dtype=compute_dtype,
+                               binning=self.binning)
+        noise_generator.add_uniform(data, self.noise * self.gain, self.offset, Naverage, self.batched_average)
+
+        upper = full_scale
+        if self.saturation is not None:
+            upper = self.saturation if full_scale is None else min(self.saturation, full_scale)
+        lower = None if full_scale is None else 0
+        if upper is None:
+            if out is None:
+                return data
+            out[...] = data
+            return out
+        if out is None:
+            out = data if Naverage > 1 else np.empty(data.shape, dtype)
+        return np.clip(data, lower, upper, out=out, casting='unsafe')
+
+    def get_rotation_coefficients(self, theta):
+        """ Get the coefficients (a, b, c) of the rotated gaussian exponent
+
+        The gaussian is exp(-(a * dx**2 + 2 * b * dx * dy + c * dy**2)), the coefficients are cached as long as
+        the angle and the beam widths are unchanged.
+
+        Parameters
+        ----------
+        theta: (float) rotation angle of the beam in degrees
+
+        Returns
+        -------
+        tuple of float
+        """
+        key = (theta, tuple(self.wh))
+        if self._rotation is None or self._rotation[0] != key:
+            angle = np.radians(theta)
+            cos, sin = np.cos(angle), np.sin(angle)
+            inv_wx2 = 1 / self.wh[0] ** 2
+            inv_wy2 = 1 / self.wh[1] ** 2
+            self._rotation = (key, (float(GAUSS_FACTOR * (cos ** 2 * inv_wx2 + sin ** 2 * inv_wy2)),
+                                    float(GAUSS_FACTOR * cos * sin * (inv_wy2 - inv_wx2)),
+                                    float(GAUSS_FACTOR * (sin ** 2 * inv_wx2 + cos ** 2 * inv_wy2))))
+        return self._rotation[1]
+
+    @staticmethod
+    def gauss1D(x, x0, dx, binning=1):
+        """ Unit amplitude gaussian profile, same convention as pymodaq_utils.math_utils.gauss1D (n=1)
+
+        If binning is larger than 1, x are the centers of the bins and the profile is summed over the binning
+        sensor pixels covered by each bin
+        """
+        if binning > 1:
+            x = (x[:, np.newaxis] + (np.arange(binning) - (binning - 1) / 2)).ravel()
+        data = (x - x0) * (1 / dx)
+        np.square(data, out=data)
+        data *= -GAUSS_FACTOR
+        np.exp(data, out=data)
+        if binning > 1:
+            return data.reshape((-1, binning)).sum(1)
+        return data
+
+    def synthesize(self, x, y, x0, y0, amp=None, dtype=np.float64, binning=1):
+        """ Noise free beam evaluated on the grid defined by the x and y vectors
+
+        For a non rotated beam (Theta == 0) the frame is the outer product of two 1D gaussians, the full rotated
+        exponent is only evaluated otherwise. With binning, a non rotated beam is exactly summed over the sensor
+        pixels of each bin while a rotated one is evaluated at the bin centers.
+
+        Parameters
+        ----------
+        x: (ndarray) x axis
+        y: (ndarray) y axis
+        x0: (float) beam position along x
+        y0: (float) beam position along y
+        amp: (float) beam amplitude, defaults to the amp attribute
+        dtype: (numpy dtype) floating point dtype of the frame
+        binning: (int) number of sensor pixels along each direction summed into one pixel of the frame
 
+        Returns
+        -------
+        ndarray of shape (len(y), len(x))
+        """
+        if amp is None:
+            amp = self.amp
+        theta = self.current_positions['Theta']
+        if theta == 0:
+            profile_y = self.gauss1D(y, y0, self.wh[1], binning)
+            profile_y *= amp
+            return np.outer(profile_y.astype(dtype, copy=False),
+                            self.gauss1D(x, x0, self.wh[0], binning).astype(dtype, copy=False))
+
+        a, b, c = self.get_rotation_coefficients(theta)
+        dx = (x - x0).astype(dtype, copy=False)
+        dy = (y - y0).astype(dtype, copy=False)[:, np.newaxis]
+        data = np.multiply(-2 * b * dy, dx)
+        data -= a * dx ** 2
+        data -= c * dy ** 2
+        np.exp(data, out=data)
+        data *= amp * binning ** 2
+        return data
+
+    def evaluate_points(self, points, binning=1, Naverage=1):
+        """ Evaluate the beam and its noise only at the given probe points
+
+        The gain and offset are applied as for the rendered frames, but the values are neither quantized nor clipped.
+
+        Parameters
+        ----------
+        points: (list of tuple or ndarray of shape (N, 2)) the (x, y) sensor pixel coordinates of the probe points
+        binning: (int) if larger than 1, the points are the centers of binned pixels whose signal is the sum of the
+            covered sensor pixels, exactly for a non rotated beam and approximated from the bin center otherwise (as
+            in synthesize)
+        Naverage: (int) number of averaged evaluations
+
+        Returns
+        -------
+        ndarray of shape (N,)
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        self.apply_drift()
+        x0, y0 = self.get_beam_center()
+        theta = self.current_positions['Theta']
+        if theta == 0:
+            data = self.gauss1D(points[:, 0], x0, self.wh[0], binning)
+            data *= self.gauss1D(points[:, 1], y0, self.wh[1], binning)
+            data *= self.amp * self.gain
+        else:
+            a, b, c = self.get_rotation_coefficients(theta)
+            dx = points[:, 0] - x0
+            dy = points[:, 1] - y0
+            data = self.amp * self.gain * binning ** 2 * np.exp(-(a * dx ** 2 + 2 * b * dx * dy + c * dy ** 2))
+        data += self.noise * self.gain * self.noise_generator.uniform_mean(data.shape, Naverage, self.batched_average)
+        data += self.offset
+        return data
+
+    def project(self, integ='vert', Naverage=1):
+        """ Mean of the beam frame along one axis computed directly as a 1D profile
+
+        A non rotated beam is separable so the profile is exact, a rotated one is projected analytically (the gaussian
+        is integrated over the extent of the readout region using the error function). The noise is the mean of as
+        many uniform draws as there are pixels along the integrated axis (times Naverage) and is drawn from its
+        reduced (normal) statistics. The gain and offset are applied as for the rendered frames, but the profile is
+        computed from values neither quantized nor clipped.
+
+        Parameters
+        ----------
+        integ: (str) either 'vert' or 'hor' to integrate vertically (profile along x) or horizontally
+        Naverage: (int) number of averaged profiles
+
+        Returns
+        -------
+        ndarray
+        """
+        self.apply_drift()
+        x0, y0 = self.get_beam_center()
+        if integ == 'vert':
+            axis, axis_int, center, center_int, width, width_int = \
+                self.get_xaxis(), self.get_yaxis(), x0, y0, self.wh[0], self.wh[1]
+        else:
+            axis, axis_int, center, center_int, width, width_int = \
+                self.get_yaxis(), self.get_xaxis(), y0, x0, self.wh[1], self.wh[0]
+        binning = self.binning
+        step = float(binning)
+        theta = self.current_positions['Theta']
+
+        if theta == 0:
+            data = self.gauss1D(axis, center, width, binning)
+            data *= self.amp * np.mean(self.gauss1D(axis_int, center_int, width_int, binning))
+        else:
+            a, b, c = self.get_rotation_coefficients(theta)
+            if integ != 'vert':
+                a, c = c, a
+            # complete the square on the integrated coordinate: a*d**2 + 2*b*d*t + c*t**2
+            #   = (a - b**2 / c) * d**2 + c * (t + b * d / c)**2
+            d = axis - center
+            shift = b / c * d
+            sqrt_c = np.sqrt(c)
+            t_low = sqrt_c * (axis_int[0] - step / 2 - center_int + shift)
+            t_high = sqrt_c * (axis_int[-1] + step / 2 - center_int + shift)
+            data = np.exp(-(a - b ** 2 / c) * d ** 2)
+            data *= (erf(t_high) - erf(t_low)) * (self.amp * binning * np.sqrt(np.pi) / (2 * sqrt_c * axis_int.size))
+
+        noise = self.noise_generator.standard_normal(data.size)
+        noise *= np.sqrt(1 / (12 * axis_int.size * Naverage))
+        noise += 0.5
+        data *= self.gain
+        data += self.noise * self.gain * noise
+        data += self.offset
+        return data
+
+    def gauss2D(self, x, y, x0, y0):
+        x = np.atleast_1d(x)
+        y = np.atleast_1d(y)
+        data = self.synthesize(x, y, x0, y0)
+        self.noise_generator.add_uniform(data, self.noise)
         return np.squeeze(data)
 
-    def get_data_output(self, data=None, data_dim='0D', x0=128, y0=128, integ='vert'):
+    def get_frame_products(self, data=None, x0=None, y0=None, integ='vert', Naverage=1):
+        """ Get the 2D, 1D and 0D outputs derived from a single frame
+
+        The 2D output is the frame itself, the 0D one is a view on the pixel (x0, y0) and the 1D one is the only
+        reduction computed.
+
+        Parameters
+        ----------
+        data: (ndarray) data as outputed by set_Mock_data, if None a new frame is synthesized
+        x0: (int) column index of the 0D output, defaults to the center of the frame
+        y0: (int) row index of the 0D output, defaults to the center of the frame
+        integ: (str) either 'vert' or 'hor', see get_data_output
+        Naverage: (int) number of averaged frames if a new frame is synthesized
+
+        Returns
+        -------
+        tuple of ndarray: (data_2D, data_1D, data_0D)
+        """
+        if data is None:
+            data = self.set_Mock_data(Naverage)
+        x0 = data.shape[1] // 2 if x0 is None else x0
+        y0 = data.shape[0] // 2 if y0 is None else y0
+        return data, np.mean(data, 0 if integ == 'vert' else 1), data[y0, x0:x0 + 1]
+
+    def get_data_output(self, data=None, data_dim='0D', x0=None, y0=None, integ='vert', Naverage=1):
         """
         Return generated data (2D gaussian) transformed depending on the parameters
         Parameters
         ----------
         data: (ndarray) data as outputed by set_Mock_data
         data_dim: (str) either '0D', '1D' or '2D'
-        x0: (int) if type is '0D" then get value of computed data at this position
-        y0: (int) if type is '0D" then get value of computed data at this position
+        x0: (int) if type is '0D" then get value of computed data at this position (column index, defaults to the
+            center of the frame)
+        y0: (int) if type is '0D" then get value of computed data at this position (row index, defaults to the
+            center of the frame)
         integ: (str) either 'vert' or 'hor'. Valid if data_dim is '1D" then get value of computed data integrated either
             vertically or horizontally
+        Naverage: (int) number of averaged acquisitions if the output is synthesized
 
         Returns
         -------
         numpy nd-array
         """
         if data is None:
-            data = self.set_Mock_data()
+            if data_dim == '0D':
+                x_axis, y_axis = self.get_xaxis(), self.get_yaxis()
+                x0 = x_axis.size // 2 if x0 is None else x0
+                y0 = y_axis.size // 2 if y0 is None else y0
+                return self.evaluate_points([(x_axis[x0], y_axis[y0])], self.binning, Naverage)
+            elif data_dim == '1D':
+                return self.project(integ, Naverage)
+            data = self.set_Mock_data(Naverage)
         if data_dim == '0D':
-            return np.array([data[x0, y0]])
+            x0 = data.shape[1] // 2 if x0 is None else x0
+            y0 = data.shape[0] // 2 if y0 is None else y0
+            return np.array([data[y0, x0]])
         elif data_dim == '1D':
             return np.mean(data, 0 if integ == 'vert' else 1)
         elif data_dim == '2D':
             return data
+
+
+class SharedBeamSteeringClient:
+    """ Proxy of a BeamSteeringController publishing its frames from another process (see start_sharing)
+
+    Frames are copies checked against concurrent writes or, if copy is False, numpy arrays wrapping the shared memory,
+    valid until n_slots - 1 newer frames have been published. Such a view is checked (see release) when the next
+    frame is requested, a view overwritten in the meantime being counted in overruns. The actuator positions are the
+    shared ones, so the client can also be used as the controller of the BeamSteering actuators.
+
+    Parameters
+    ----------
+    name: (str) name of the shared memory block
+    copy: (bool) if False, frames are read-only views on the shared memory
+    timeout: (float) maximum time in seconds get_frame waits for a new frame before returning the latest one
+    """
+    axis = BeamSteeringController.axis
+    Nactuators = len(axis)
+
+    def __init__(self, name, copy=True, timeout=1.):
+        from pymodaq_plugins_pid.hardware.shared_frames import SharedFrameRing, SharedPositions
+        self.ring = SharedFrameRing.attach(name)
+        self.current_positions = SharedPositions(self.ring.positions, self.axis)
+        self.copy = copy
+        self.timeout = timeout
+        self.index = None
+        self.info = None
+        self.shape = None
+        self._in_use = None
+
+    @property
+    def frames_read(self):
+        return self.ring.frames_read
+
+    @property
+    def frames_missed(self):
+        """Number of frames published but never read"""
+        return self.ring.frames_missed
+
+    @property
+    def overruns(self):
+        """Number of frames overwritten while being copied, or before being released if read without copy"""
+        return self.ring.overruns
+
+    def close(self):
+        self.ring.close()
+
+    def check_position(self, axis):
+        return self.current_positions[axis]
+
+    def move_abs(self, position, axis):
+        self.current_positions[axis] = position
+
+    def move_rel(self, position, axis):
+        self.current_positions[axis] += position
+
+    def is_valid(self, index=None):
+        """Check that the frame index (by default the last one returned) has not been overwritten"""
+        return self.ring.is_valid(self.index if index is None else index)
+
+    def release(self):
+        """ Check that the last frame read without copy was not overwritten while in use
+
+        Returns
+        -------
+        bool: True if it was still valid (or if there is no such frame)
+        """
+        index, self._in_use = self._in_use, None
+        return True if index is None else self.ring.release(index)
+
+    def get_frame(self):
+        """ Get the next published frame, or the latest one if none is published within timeout
+
+        The previous frame, if read without copy, is released (it should not be used anymore).
+
+        Returns
+        -------
+        ndarray: the frame, None if no frame was ever published
+        """
+        self.release()
+        last = -1 if self.index is None else self.index
+        deadline = perf_counter() + self.timeout
+        while self.ring.frames_written - 1 <= last and perf_counter() < deadline:
+            sleep(0.0005)
+        index, frame, info = self.ring.read_latest(self.copy)
+        if frame is not None:
+            self.index, self.info, self.shape = index, info, frame.shape
+            if not self.copy:
+                self._in_use = index
+        return frame
+
+    def _get_axis(self, dim):
+        if self.info is None and self.get_frame() is None:
+            raise TimeoutError(f'no frame published in {self.ring.name}')
+        binning = self.info['binning']
+        start = self.info['x'] if dim == 1 else self.info['y']
+        return start + binning * np.arange(self.shape[dim]) + (binning - 1) / 2
+
+    def get_xaxis(self):
+        """Sensor coordinates of the columns of the last frame (a frame is waited for if none was read yet)"""
+        return self._get_axis(1)
+
+    def get_yaxis(self):
+        return self._get_axis(0)
+
+
+def serve(name='beam_steering', n_slots=4, period=0.01, **kwargs):
+    """ Run a mock camera publishing its frames into the shared memory block name until interrupted
+
+    Parameters
+    ----------
+    name: (str)
+    n_slots: (int)
+    period: (float) publication period of the frames in seconds
+    kwargs: the BeamSteeringController arguments
+    """
+    controller = BeamSteeringController(**kwargs)
+    controller.start_sharing(name, n_slots, period)
+    try:
+        while True:
+            sleep(1.)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        controller.stop_sharing()
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Mock beam steering camera publishing into shared memory')
+    parser.add_argument('--name', default='beam_steering')
+    parser.add_argument('--slots', type=int, default=4)
+    parser.add_argument('--period', type=float, default=0.01)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+    serve(args.name, args.slots, args.period, seed=args.seed)
@@ -1,56 +1,138 @@
-from time import perf_counter
-from qtpy.QtCore import QObject
-from numpy.random import random
-import numpy as np
-from pymodaq import Q_
+from pymodaq_plugins_pid.hardware.boiler_core import BoilerCore, BoilerBankCore, neighbour_coupling
 
 
-class BoilerController(QObject):
+def start_timer(callback, interval):
+    """ Call callback every interval seconds from a Qt timer, qtpy being only imported here
+
+    Returns
+    -------
+    QTimer: to be kept alive as long as the calls are needed
+    """
+    from qtpy.QtCore import QTimer
+    timer = QTimer()
+    timer.timeout.connect(callback)
+    timer.start(int(interval * 1000))
+    return timer
+
+
+class BoilerController:
+    """ Plugin side adapter of the mock boiler, the physics being in BoilerCore
+
+    Parameters
+    ----------
+    seed: (int) seed of the noise generator, None for a random one
+    lazy: (bool) if False, the temperature is also updated by a Qt timer every tick, otherwise it is only advanced
+        on grab or power change
+    clock: (Clock) time source, the default clock if None
+    """
     _current_temperature = 20.
     _ambiant_temperature = 19.
     _noise = 0.1
+    _tau = 1.  # thermal time constant in seconds
 
-    def __init__(self, ):
-        super().__init__()
-        self.startTimer(10)
-        self._current_power = 0.
-        self._ellapsed_time = Q_(0., 's')
-        self._tau = Q_(1, 's')
+    def __init__(self, seed=None, lazy=True, clock=None):
+        self.core = BoilerCore(seed, self._current_temperature, self._ambiant_temperature, self._noise, self._tau,
+                               clock)
+        self.lazy = lazy
+        self._timer = None if lazy else start_timer(self.core.advance, self.core._tick)
 
-    def timerEvent(self, event):
-        dt = perf_counter() - self._ellapsed_time
-        self._ellapsed_time += dt
+    @property
+    def noise_generator(self):
+        return self.core.noise_generator
 
-        self._current_temperature += 1 * self._current_power * dt + self._noise * (random() - 0.5)
-        # some heat dissipation
-        self._current_temperature -= 0.2 * dt
-        self._current_temperature = np.clip(self._current_temperature, self.ambiant_temp, None)
+    def advance(self):
+        self.core.advance()
 
     def check_position(self):
-        return self._current_power
+        return self.core.check_position()
 
     def move_abs(self, value):
-        self._current_power = value
+        self.core.move_abs(value)
 
     @property
     def ambiant_temp(self):
-        return self._ambiant_temperature
+        return self.core.ambiant_temp
 
     @ambiant_temp.setter
     def ambiant_temp(self, temperature):
-        self._ambiant_temperature = temperature
+        self.core.ambiant_temp = temperature
 
 
     @property
     def noise(self):
-        return self._noise
+        return self.core.noise
 
     @noise.setter
     def noise(self, noise):
-        self._noise = noise
+        self.core.noise = noise
 
     def move_rel(self, value):
-        self._current_power += value
+        self.core.move_rel(value)
+
+    def grab(self):
+        return self.core.grab()
+
+
+class BoilerBankController:
+    """ Plugin side adapter of a bank of mock boiler zones, the physics being in BoilerBankCore
+
+    Parameters
+    ----------
+    n_zones: (int) number of zones
+    seed: (int) seed of the noise generator, None for a random one
+    coupling: (float) heat exchange rate between neighbouring zones, 0 for independent zones
+    lazy: (bool) if False, the temperatures are also updated by a Qt timer every tick
+    clock: (Clock) time source, the default clock if None
+    """
+    _current_temperature = BoilerController._current_temperature
+    _ambiant_temperature = BoilerController._ambiant_temperature
+    _noise = BoilerController._noise
+    _tau = BoilerController._tau
+
+    def __init__(self, n_zones=8, seed=None, coupling=0., lazy=True, clock=None):
+        self.core = BoilerBankCore(n_zones, seed, self._current_temperature, self._ambiant_temperature, self._noise,
+                                   self._tau, clock=clock)
+        self.set_coupling(coupling)
+        self.lazy = lazy
+        self._timer = None if lazy else start_timer(self.core.advance, self.core._tick)
+
+    @property
+    def noise_generator(self):
+        return self.core.noise_generator
+
+    @property
+    def zone_names(self):
+        return self.core.zone_names
+
+    def set_coupling(self, coupling):
+        """Set the heat exchange rate between neighbouring zones"""
+        self.core.advance()
+        self.core.set_coupling(neighbour_coupling(self.core.n_zones, coupling) if coupling > 0 else None)
+
+    def check_position(self, zone=0):
+        return self.core.check_position(zone)
+
+    def move_abs(self, value, zone=0):
+        self.core.move_abs(value, zone)
+
+    def move_rel(self, value, zone=0):
+        self.core.move_rel(value, zone)
+
+    @property
+    def ambiant_temp(self):
+        return self.core.ambiant_temp
+
+    @ambiant_temp.setter
+    def ambiant_temp(self, temperature):
+        self.core.ambiant_temp = temperature
+
+    @property
+    def noise(self):
+        return self.core.noise
+
+    @noise.setter
+    def noise(self, noise):
+        self.core.noise = noise
 
     def grab(self):
-        return self._current_temperature
+        return self.core.grab()
@@ -0,0 +1,230 @@
+import numpy as np
+from pymodaq_plugins_pid.hardware.clock import get_default_clock
+from pymodaq_plugins_pid.hardware.noise import NoiseGenerator
+
+
+class BoilerCore:
+    """ Physics of the mock boiler, a first order thermal model: dT/dt = P - (T - T_ambiant) / tau
+
+    As a heater cannot cool, the temperature never goes below the ambiant one: a negative power only lets the boiler
+    relax down to it. Pure numpy, without Qt nor pint, so it can run in worker processes or headless. Nothing runs between reads: the
+    temperature is advanced with the exponential solution from the last update on each grab or power change. The
+    noise, defined per tick of 10 ms, is drawn once per update from the statistics of its accumulation (and
+    relaxation) over the elapsed ticks.
+
+    Parameters
+    ----------
+    seed: (int) seed of the noise generator, None for a random one
+    temperature: (float) initial temperature
+    ambiant_temp: (float) ambiant temperature
+    noise: (float) amplitude of the uniform noise added every tick
+    tau: (float) thermal time constant in seconds
+    clock: (Clock) time source, the default clock if None (see clock.set_default_clock)
+    """
+    _tick = 0.01  # period in seconds the noise level is defined for
+
+    def __init__(self, seed=None, temperature=20., ambiant_temp=19., noise=0.1, tau=1., clock=None):
+        self.noise_generator = NoiseGenerator(seed)
+        self.temperature = temperature
+        self.ambiant_temp = ambiant_temp
+        self.noise = noise
+        self.tau = tau
+        self.power = 0.
+        self.clock = get_default_clock() if clock is None else clock
+        self._last_time = self.clock.now()
+
+    def step(self, dt):
+        """Evolve the temperature over dt seconds at the current power"""
+        if dt <= 0:
+            return self.temperature
+        decay = np.exp(-dt / self.tau)
+        steady = self.ambiant_temp + self.power * self.tau
+        # uniform noises in [-noise / 2, noise / 2) added every tick and relaxing with tau
+        noise = self.noise * np.sqrt(self.tau * (1 - decay ** 2) / (24 * self._tick))
+        # the exponential solution is monotonic so clipping its end point is exact (but for the noise)
+        self.temperature = float(max(steady + (self.temperature - steady) * decay +
+                                     noise * self.noise_generator.standard_normal(), self.ambiant_temp))
+        return self.temperature
+
+    def advance(self):
+        """Evolve the temperature from the last update up to the current time of the clock"""
+        now = self.clock.now()
+        dt = now - self._last_time
+        self._last_time = now
+        return self.step(dt)
+
+    def check_position(self):
+        return self.power
+
+    def move_abs(self, value):
+        self.advance()
+        self.power = value
+
+    def move_rel(self, value):
+        self.advance()
+        self.power += value
+
+    def grab(self):
+        return self.advance()
+
+
+def neighbour_coupling(n_zones, coupling, periodic=False):
+    """ Symmetric coupling matrix between each zone and its direct neighbours in a row of zones
+
+    Parameters
+    ----------
+    n_zones: (int) number of zones
+    coupling: (float) heat exchange rate (in 1/s) between neighbouring zones
+    periodic: (bool) if True, the first and last zones are neighbours (ring of zones)
+
+    Returns
+    -------
+    ndarray: (n_zones, n_zones) array
+    """
+    matrix = np.zeros((n_zones, n_zones))
+    inds = np.arange(n_zones - 1)
+    matrix[inds, inds + 1] = coupling
+    matrix[inds + 1, inds] = coupling
+    if periodic and n_zones > 2:
+        matrix[0, -1] = matrix[-1, 0] = coupling
+    return matrix
+
+
+class BoilerBankCore:
+    """ Bank of thermal zones, each with its own heater, advanced together in one vectorized step
+
+    Each zone follows the first order model of BoilerCore, with an optional heat exchange between zones:
+    dT/dt = P - (T - T_ambiant) / tau - sum_j K_ij (T_i - T_j), the temperatures being clipped at the ambiant ones
+
+    Without coupling, all the zones are advanced elementwise. With a coupling matrix K, the system is solved in the
+    eigenbasis of the (symmetric) rate matrix diag(1 / tau) + diag(sum_j K_ij) - K, computed once per coupling
+    change, and the noise is drawn with its exact covariance.
+
+    Parameters
+    ----------
+    n_zones: (int) number of zones
+    seed: (int) seed of the noise generator, None for a random one
+    temperature: (float or ndarray) initial temperatures
+    ambiant_temp: (float or ndarray) ambiant temperatures
+    noise: (float) amplitude of the uniform noise added every tick in each zone
+    tau: (float or ndarray) thermal time constants in seconds
+    coupling: (ndarray) optional (n_zones, n_zones) symmetric coupling matrix in 1/s, see neighbour_coupling
+    clock: (Clock) time source, the default clock if None (see clock.set_default_clock)
+    """
+    _tick = BoilerCore._tick
+
+    def __init__(self, n_zones, seed=None, temperature=20., ambiant_temp=19., noise=0.1, tau=1., coupling=None,
+                 clock=None):
+        self.n_zones = n_zones
+        self.noise_generator = NoiseGenerator(seed)
+        self.temperature = np.full(n_zones, temperature, dtype=float)
+        self.ambiant_temp = ambiant_temp
+        self.noise = noise
+        self.power = np.zeros(n_zones)
+        self._tau = np.broadcast_to(np.asarray(tau, dtype=float), (n_zones,))
+        self._coupling = None
+        self._eigen = None
+        self.set_coupling(coupling)
+        self.clock = get_default_clock() if clock is None else clock
+        self._last_time = self.clock.now()
+
+    @staticmethod
+    def get_zone_names(n_zones):
+        return [f'Zone{ind:03d}' for ind in range(n_zones)]
+
+    @property
+    def zone_names(self):
+        return self.get_zone_names(self.n_zones)
+
+    def get_zone_index(self, zone):
+        """Get the index of a zone from its index or name"""
+        if isinstance(zone, str):
+            return self.zone_names.index(zone)
+        return int(zone)
+
+    @property
+    def tau(self):
+        return self._tau
+
+    @tau.setter
+    def tau(self, tau):
+        self._tau = np.broadcast_to(np.asarray(tau, dtype=float), (self.n_zones,))
+        self._eigen = None
+
+    @property
+    def coupling(self):
+        return self._coupling
+
+    def set_coupling(self, coupling=None):
+        """ Set the coupling matrix between zones, None for independent zones"""
+        if coupling is not None:
+            coupling = np.asarray(coupling, dtype=float)
+            if coupling.shape != (self.n_zones, self.n_zones) or not np.allclose(coupling, coupling.T):
+                raise ValueError(f'The coupling should be a symmetric ({self.n_zones}, {self.n_zones}) matrix')
+            coupling = coupling.copy()
+            np.fill_diagonal(coupling, 0.)
+            if not np.any(coupling):
+                coupling = None
+        self._coupling = coupling
+        self._eigen = None
+
+    def _get_eigen(self):
+        if self._eigen is None:
+            rates = np.diag(1 / self._tau + self._coupling.sum(axis=1)) - self._coupling
+            self._eigen = np.linalg.eigh(rates)
+        return self._eigen
+
+    def get_steady_state(self):
+        """Temperatures reached at the current powers"""
+        if self._coupling is None:
+            return self.ambiant_temp + self.power * self._tau
+        rates, vectors = self._get_eigen()
+        return self.ambiant_temp + vectors @ ((vectors.T @ self.power) / rates)
+
+    def step(self, dt):
+        """Evolve the temperatures over dt seconds at the current powers"""
+        if dt <= 0:
+            return self.temperature
+        steady = self.get_steady_state()
+        # uniform noises in [-noise / 2, noise / 2) added every tick and relaxing with the rates
+        scale = self.noise / np.sqrt(12 * self._tick)
+        normal = self.noise_generator.standard_normal(self.n_zones)
+        if self._coupling is None:
+            decay = np.exp(-dt / self._tau)
+            self.temperature = steady + (self.temperature - steady) * decay + \
+                scale * np.sqrt(self._tau * (1 - decay ** 2) / 2) * normal
+        else:
+            rates, vectors = self._get_eigen()
+            decay = np.exp(-dt * rates)
+            modes = (vectors.T @ (self.temperature - steady)) * decay + \
+                scale * np.sqrt((1 - decay ** 2) / (2 * rates)) * normal
+            self.temperature = steady + vectors @ modes
+        np.maximum(self.temperature, self.ambiant_temp, out=self.temperature)
+        return self.temperature
+
+    def advance(self):
+        """Evolve the temperatures from the last update up to the current time of the clock"""
+        now = self.clock.now()
+        dt = now - self._last_time
+        self._last_time = now
+        return self.step(dt)
+
+    def check_position(self, zone=0):
+        return float(self.power[self.get_zone_index(zone)])
+
+    def move_abs(self, value, zone=0):
+        self.advance()
+        self.power[self.get_zone_index(zone)] = value
+
+    def move_rel(self, value, zone=0):
+        self.advance()
+        self.power[self.get_zone_index(zone)] += value
+
+    def set_powers(self, powers):
+        """Set the powers of all the zones at once"""
+        self.advance()
+        self.power[:] = powers
+
+    def grab(self):
+        """Get a copy of the temperatures of all the zones"""
+        return self.advance().copy()
@@ -0,0 +1,79 @@
+from time import perf_counter
+
+
+class Clock:
+    """ Wall clock (perf_counter based) running time_scale times faster than real time
+
+    Parameters
+    ----------
+    time_scale: (float) number of simulated seconds per real second
+    """
+
+    def __init__(self, time_scale=1.):
+        self._time_scale = time_scale
+        self._origin = perf_counter()
+        self._start = 0.
+
+    @property
+    def time_scale(self):
+        return self._time_scale
+
+    @time_scale.setter
+    def time_scale(self, time_scale):
+        # rebase so that the time does not jump
+        self._start = self.now()
+        self._origin = perf_counter()
+        self._time_scale = time_scale
+
+    def now(self):
+        """Current time in seconds"""
+        return self._start + (perf_counter() - self._origin) * self._time_scale
+
+    def step(self, dt):
+        """Nothing to do, the wall clock advances by itself"""
+        pass
+
+
+class SteppedClock(Clock):
+    """ Clock that only advances when stepped, exactly by the given durations (for instance each PID dt)
+
+    Parameters
+    ----------
+    start: (float) initial time in seconds
+    """
+
+    def __init__(self, start=0.):
+        super().__init__()
+        self._time = start
+
+    @property
+    def time_scale(self):
+        return None
+
+    @time_scale.setter
+    def time_scale(self, time_scale):
+        if time_scale is not None:
+            raise ValueError('a SteppedClock has no time scale, it only advances when stepped')
+
+    def now(self):
+        return self._time
+
+    def step(self, dt):
+        self._time += dt
+
+
+_default_clock = None
+
+
+def get_default_clock():
+    """Get the clock used by the controllers created without explicit clock (a real time Clock if never set)"""
+    global _default_clock
+    if _default_clock is None:
+        _default_clock = Clock()
+    return _default_clock
+
+
+def set_default_clock(clock=None):
+    """Set the clock used by the controllers created from now on without explicit clock, None for real time"""
+    global _default_clock
+    _default_clock = clock
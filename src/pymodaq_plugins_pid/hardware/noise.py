@@ -0,0 +1,111 @@
+import numpy as np
+
+
+class NoiseGenerator:
+    """ Seedable noise source for the mock controllers built on numpy.random.Generator
+
+    Parameters
+    ----------
+    seed: (int or None) seed of the bit generator, None for a random one
+    bit_generator: (str) one of the keys of bit_generators
+    dtype: (numpy dtype) either float64 or float32, dtype of the generated values
+    ring_size: (int) if non zero, frames returned by random/add_uniform are views at random offsets into a pool of
+        ring_size pre-generated frames instead of fresh draws (batched averages are always drawn fresh). The pool is
+        sized for the largest frame requested, smaller frames (e.g. the 0D data of a slave of a 2D controller) being
+        served from it too
+    """
+    bit_generators = {'PCG64': np.random.PCG64, 'SFC64': np.random.SFC64}
+
+    def __init__(self, seed=None, bit_generator='PCG64', dtype=np.float64, ring_size=0):
+        self.dtype = np.dtype(dtype)
+        self.ring_size = ring_size
+        self.bit_generator = bit_generator
+        self._rng: np.random.Generator = None
+        self._ring = None
+        self._work = None
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Reset the bit generator with a new seed (None for a random one) and discard the pre-generated frames"""
+        self._rng = np.random.Generator(self.bit_generators[self.bit_generator](seed))
+        self._ring = None
+
+    def spawn(self):
+        """Get a new generator with the same settings and an independent stream seeded from this one"""
+        return NoiseGenerator(int(self._rng.integers(2 ** 63)), self.bit_generator, self.dtype, self.ring_size)
+
+    def set_dtype(self, dtype):
+        if np.dtype(dtype) != self.dtype:
+            self.dtype = np.dtype(dtype)
+            self._ring = None
+            self._work = None
+
+    def set_ring_size(self, ring_size):
+        if ring_size != self.ring_size:
+            self.ring_size = ring_size
+            self._ring = None
+
+    def _get_ring_frame(self, size):
+        if self._ring is None or self._ring.size < self.ring_size * size:
+            self._ring = self._rng.random(self.ring_size * size, dtype=self.dtype)
+            self._ring.flags.writeable = False
+        offset = self._rng.integers(0, self._ring.size - size, endpoint=True)
+        return self._ring[offset:offset + size]
+
+    def random(self, shape=None):
+        """ Uniform noise in [0, 1)
+
+        Scalar draws are always fresh, frames may come from the pre-generated ring (and are then read-only views)
+        """
+        if shape is None:
+            return self._rng.random()
+        if self.ring_size > 0:
+            return self._get_ring_frame(int(np.prod(shape))).reshape(shape)
+        return self._rng.random(shape, dtype=self.dtype)
+
+    def standard_normal(self, shape=None):
+        return self._rng.standard_normal(shape, dtype=self.dtype)
+
+    def uniform_mean(self, shape, naverage=1, batched=False, out=None):
+        """ Mean of naverage uniform draws in [0, 1)
+
+        Parameters
+        ----------
+        shape: (tuple of int) shape of the output
+        naverage: (int) number of averaged draws
+        batched: (bool) if True, the naverage draws are generated at once and reduced, otherwise the mean is drawn
+            directly from its statistics (normal with mean 1/2 and variance 1 / (12 * naverage))
+        out: (ndarray) optional output array
+
+        Returns
+        -------
+        ndarray
+        """
+        if out is None:
+            out = np.empty(shape, dtype=self.dtype)
+        if naverage <= 1:
+            if self.ring_size > 0:
+                out[...] = self.random(shape)
+            else:
+                self._rng.random(out=out, dtype=self.dtype)
+        elif batched:
+            np.mean(self._rng.random((naverage,) + tuple(shape), dtype=self.dtype), axis=0, out=out)
+        else:
+            self._rng.standard_normal(out=out, dtype=self.dtype)
+            out *= np.sqrt(1 / (12 * naverage))
+            out += 0.5
+        return out
+
+    def add_uniform(self, data, scale=1., offset=0., naverage=1, batched=False):
+        """Add in place to data a uniform noise in [offset, offset + scale) averaged naverage times"""
+        if self._work is None or self._work.shape != data.shape:
+            self._work = np.empty(data.shape, dtype=self.dtype)
+        if naverage <= 1 and self.ring_size > 0:
+            np.multiply(self.random(data.shape), scale, out=self._work)
+        else:
+            self.uniform_mean(data.shape, naverage, batched, out=self._work)
+            self._work *= scale
+        if offset != 0:
+            self._work += offset
+        data += self._work
+        return data
@@ -0,0 +1,290 @@
+""" Ring of frames in shared memory, written by one process and read zero-copy by others
+
+Layout of the shared memory block (all fields are 8 bytes, little endian on the supported platforms):
+
+    header:  magic, n_slots, slot_bytes, frames_written, 4 reserved
+    positions: 8 float64 (the actuator positions shared by the writer and the readers)
+    n_slots times:
+        slot header: sequence, rows, cols, dtype code, x, y, binning, timestamp (monotonic ns)
+        slot data: slot_bytes rounded up to 64 bytes
+
+Frame n is written into slot n % n_slots. The slot sequence is a seqlock: it is odd (2n + 1) while frame n is being
+written and even (2n + 2) once written, frames_written being incremented afterwards. A reader checks the sequence
+before and after reading the slot header and copying the data. A zero-copy view can only be checked once the reader
+is done with it (see release): a changed sequence means the frame was overwritten meanwhile. There is a single
+writer, readers never write but the positions.
+"""
+from collections.abc import MutableMapping
+from multiprocessing import resource_tracker, shared_memory
+from time import monotonic_ns
+
+import numpy as np
+
+MAGIC = 0x42534652  # 'BSFR'
+HEADER_SIZE = 8
+POSITIONS_SIZE = 8
+SLOT_HEADER_SIZE = 8
+ALIGNMENT = 64
+
+# dtype code stored in the slot header: dtype
+dtypes = {0: np.dtype(np.float64), 1: np.dtype(np.float32), 2: np.dtype(np.uint8), 3: np.dtype(np.uint16)}
+dtype_codes = {dtype: code for code, dtype in dtypes.items()}
+
+
+def _attach(name):
+    """ Attach to an existing shared memory block without registering it to the resource tracker, which would
+    otherwise unlink it when this process exits (only the creating process should)"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # python >= 3.13
+    except TypeError:
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedFrameRing:
+    """ Ring of n_slots frames of at most slot_bytes bytes in a shared memory block
+
+    Use create in the writing process and attach in the reading ones.
+
+    Parameters
+    ----------
+    shm: (SharedMemory) the shared memory block
+    owner: (bool) True if this instance created the block (and unlinks it on close)
+    """
+
+    def __init__(self, shm, owner=False):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((HEADER_SIZE,), np.int64, shm.buf)
+        if self.header[0] != MAGIC:
+            raise ValueError(f'{shm.name} is not a shared frame ring')
+        self.n_slots = int(self.header[1])
+        self.slot_bytes = int(self.header[2])
+        self.positions = np.ndarray((POSITIONS_SIZE,), np.float64, shm.buf, HEADER_SIZE * 8)
+        self._stride = SLOT_HEADER_SIZE * 8 + self.get_padded_size(self.slot_bytes)
+        self._slots_offset = (HEADER_SIZE + POSITIONS_SIZE) * 8
+        self._slot_headers = [np.ndarray((SLOT_HEADER_SIZE,), np.int64, shm.buf,
+                                         self._slots_offset + ind * self._stride) for ind in range(self.n_slots)]
+        self._writing = None
+
+        self.frames_read = 0
+        self.frames_missed = 0
+        self.overruns = 0
+        self._last_read = None
+
+    @staticmethod
+    def get_padded_size(size):
+        return -(-size // ALIGNMENT) * ALIGNMENT
+
+    @classmethod
+    def get_size(cls, n_slots, slot_bytes):
+        """Size in bytes of the shared memory block of a ring"""
+        return (HEADER_SIZE + POSITIONS_SIZE) * 8 + n_slots * (SLOT_HEADER_SIZE * 8 + cls.get_padded_size(slot_bytes))
+
+    @classmethod
+    def create(cls, name=None, n_slots=4, slot_bytes=256 * 256 * 8):
+        """ Create a new ring
+
+        Parameters
+        ----------
+        name: (str) name of the shared memory block, a random one if None
+        n_slots: (int) number of frames kept, a zero-copy frame may be used until n_slots - 1 newer frames are written
+        slot_bytes: (int) maximum size of a frame in bytes
+        """
+        if n_slots < 2:
+            raise ValueError('a shared frame ring needs at least 2 slots')
+        shm = shared_memory.SharedMemory(name=name, create=True, size=cls.get_size(n_slots, slot_bytes))
+        header = np.ndarray((HEADER_SIZE,), np.int64, shm.buf)
+        header[:] = [MAGIC, n_slots, slot_bytes, 0, 0, 0, 0, 0]
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to the existing ring of the given name"""
+        return cls(_attach(name))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def frames_written(self):
+        return int(self.header[3])
+
+    def close(self):
+        """ Detach from the ring, and destroy it if this instance created it
+
+        The frames returned without copy must not be used afterwards.
+        """
+        self.header = self.positions = None
+        self._slot_headers = []
+        try:
+            self.shm.close()
+        except BufferError:  # frames read without copy are still referenced, the mapping is released with them
+            pass
+        if self.owner:
+            self.shm.unlink()
+
+    def _get_data(self, slot, shape, dtype):
+        return np.ndarray(shape, dtype, self.shm.buf, self._slots_offset + slot * self._stride + SLOT_HEADER_SIZE * 8)
+
+    def begin_write(self, shape, dtype, origin=(0, 0), binning=1):
+        """ Start writing the next frame
+
+        Parameters
+        ----------
+        shape: (tuple of int) (rows, cols) of the frame
+        dtype: (numpy dtype) one of dtypes
+        origin: (tuple of int) (x, y) sensor coordinates of the first pixel
+        binning: (int)
+
+        Returns
+        -------
+        ndarray: view on the slot data to write the frame into before calling end_write. If end_write is not called,
+            the slot stays invalid until it is written again.
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in dtype_codes:
+            raise ValueError(f'dtype should be one of {list(dtypes.values())}')
+        if shape[0] * shape[1] * dtype.itemsize > self.slot_bytes:
+            raise ValueError(f'a frame of shape {shape} and dtype {dtype} is larger than the {self.slot_bytes} bytes '
+                             f'of the slots')
+        index = self.frames_written
+        slot_header = self._slot_headers[index % self.n_slots]
+        slot_header[0] = 2 * index + 1
+        slot_header[1:] = [shape[0], shape[1], dtype_codes[dtype], origin[0], origin[1], binning, 0]
+        self._writing = index
+        return self._get_data(index % self.n_slots, shape, dtype)
+
+    def end_write(self):
+        """ Publish the frame started with begin_write
+
+        Returns
+        -------
+        int: index of the frame
+        """
+        index, self._writing = self._writing, None
+        slot_header = self._slot_headers[index % self.n_slots]
+        slot_header[7] = monotonic_ns()
+        slot_header[0] = 2 * index + 2
+        self.header[3] = index + 1
+        return index
+
+    def write(self, frame, origin=(0, 0), binning=1):
+        """Copy a frame into the ring and publish it, returns its index"""
+        self.begin_write(frame.shape, frame.dtype, origin, binning)[...] = frame
+        return self.end_write()
+
+    def is_valid(self, index):
+        """Check that frame index is still in the ring"""
+        return self._slot_headers[index % self.n_slots][0] == 2 * index + 2
+
+    def release(self, index):
+        """ Check, once done with a frame read without copy, that it was not overwritten while in use (counted in
+        overruns otherwise)
+
+        Returns
+        -------
+        bool: True if the frame was still valid
+        """
+        valid = self.is_valid(index)
+        if not valid:
+            self.overruns += 1
+        return valid
+
+    def read(self, index, copy=False):
+        """ Read a frame
+
+        Parameters
+        ----------
+        index: (int) index of the frame
+        copy: (bool) if False, return a view on the shared memory, valid as long as is_valid(index), to be checked
+            with release once used. Only a copy is checked against a concurrent write of its data.
+
+        Returns
+        -------
+        tuple: (frame, info), info being the dict of the x, y, binning and timestamp of the frame, (None, None) if the
+            frame is not in the ring anymore (or not yet)
+        """
+        slot_header = self._slot_headers[index % self.n_slots]
+        sequence = 2 * index + 2
+        if slot_header[0] != sequence:
+            return None, None
+        rows, cols, code, x, y, binning, timestamp = slot_header[1:].tolist()
+        frame = self._get_data(index % self.n_slots, (rows, cols), dtypes.get(code, dtypes[0]))
+        if copy:
+            frame = frame.copy()
+        if slot_header[0] != sequence:
+            return None, None
+        if not copy:
+            frame.flags.writeable = False
+        return frame, dict(x=x, y=y, binning=binning, timestamp=timestamp)
+
+    def read_latest(self, copy=False):
+        """ Read the latest frame
+
+        Frames written since the previous call but not read are counted in frames_missed, frames overwritten while
+        being read (the read is then retried on the newer frame) in overruns. A frame read without copy should be
+        checked with release once used.
+
+        Returns
+        -------
+        tuple: (index, frame, info), see read, (None, None, None) if no frame was written yet
+        """
+        while True:
+            index = self.frames_written - 1
+            if index < 0:
+                return None, None, None
+            frame, info = self.read(index, copy)
+            if frame is not None:
+                break
+            self.overruns += 1
+        if self._last_read is not None and index > self._last_read + 1:
+            self.frames_missed += index - self._last_read - 1
+        if index != self._last_read:
+            self.frames_read += 1
+        self._last_read = index
+        return index, frame, info
+
+
+class SharedPositions(MutableMapping):
+    """ Dict like access by axis name to positions stored in a shared array
+
+    Parameters
+    ----------
+    array: (ndarray) float64 array with at least as many elements as axis
+    axis: (list of str)
+    positions: (dict) optional initial positions
+    """
+
+    def __init__(self, array, axis, positions=None):
+        self.array = array
+        self.axis = list(axis)
+        self._indexes = {name: ind for ind, name in enumerate(self.axis)}
+        if positions is not None:
+            self.update(positions)
+
+    def __getitem__(self, key):
+        return float(self.array[self._indexes[key]])
+
+    def __setitem__(self, key, value):
+        if key not in self._indexes:
+            raise KeyError(f'{key} is not one of the shared axis {self.axis}')
+        self.array[self._indexes[key]] = value
+
+    def __delitem__(self, key):
+        raise TypeError('shared positions cannot be deleted')
+
+    def __iter__(self):
+        return iter(self.axis)
+
+    def __len__(self):
+        return len(self.axis)
+
+    def __repr__(self):
+        return repr(dict(self))
@@ -2,7 +2,9 @@ import numpy as np
 from pymodaq.extensions.pid.utils import PIDModelGeneric, DataToActuatorPID, main
 from pymodaq_data.data import DataToExport, DataCalculated
 from pymodaq.utils.data import DataActuator
-from scipy.ndimage import center_of_mass
+from pymodaq_plugins_pid.utils.centroid import BeamTracker, MomentKernel
+from pymodaq_plugins_pid.hardware.clock import get_default_clock
+from pymodaq_plugins_pid.utils.instrumentation import instrumented
 
 
 class PIDModelBeamSteering(PIDModelGeneric):
@@ -17,10 +19,28 @@ class PIDModelBeamSteering(PIDModelGeneric):
     detectors_name = ['Camera']
 
     Nsetpoints = 2
-    params = [{'title': 'Threshold', 'name': 'threshold', 'type': 'float', 'value': 10.}]
+    params = [{'title': 'Threshold', 'name': 'threshold', 'type': 'float', 'value': 10.},
+              {'title': 'Tracking:', 'name': 'tracking', 'type': 'bool', 'value': False,
+               'tip': 'Compute the centroid only in a window around the previous one'},
+              {'title': 'Window (sigmas):', 'name': 'n_sigma', 'type': 'float', 'value': 4., 'min': 1.,
+               'tip': 'Half size of the tracking window in units of the measured beam width'},
+              {'title': 'Second moments:', 'name': 'second_moments', 'type': 'bool', 'value': False,
+               'tip': 'Also compute the beam orientation and ellipticity (see the moments attribute)'},
+              {'title': 'Backend:', 'name': 'backend', 'type': 'list', 'value': 'numpy',
+               'limits': MomentKernel.backends,
+               'tip': 'auto uses the fused numba kernel if numba is installed, compiled when selected (about 10 s '
+                      'the first time, then loaded from the numba cache)'},
+              {'title': 'Pyramid:', 'name': 'pyramid', 'type': 'list', 'value': 1, 'limits': BeamTracker.pyramids,
+               'tip': 'Block size of the coarse full frame search, 1 to search at full resolution'},
+              ]
 
     def __init__(self, pid_controller):
         super().__init__(pid_controller)
+        self.tracker = BeamTracker(n_sigma=self.settings.child('n_sigma').value(),
+                                   kernel=MomentKernel(self.settings.child('second_moments').value(),
+                                                       self.settings.child('backend').value()),
+                                   pyramid=self.settings.child('pyramid').value())
+        self.moments = None
 
     def update_settings(self, param):
         """
@@ -29,12 +49,23 @@ class PIDModelBeamSteering(PIDModelGeneric):
         ----------
         param: (Parameter) instance of Parameter object
         """
-        if param.name() == '':
-            pass
+        if param.name() == 'n_sigma':
+            self.tracker.n_sigma = param.value()
+        elif param.name() == 'second_moments':
+            self.tracker.kernel.second_moments = param.value()
+        elif param.name() == 'backend':
+            self.tracker.kernel.backend = param.value()
+            self.tracker.kernel.warm_up()
+        elif param.name() == 'pyramid':
+            self.tracker.pyramid = param.value()
+        elif param.name() in ['threshold', 'tracking']:
+            self.tracker.reset()
 
     def ini_model(self):
         super().ini_model()
+        self.tracker.kernel.warm_up()
 
+    @instrumented(advance=True)
     def convert_input(self, measurements):
         """
         Convert the measurements in the units to be fed to the PID (same dimensionality as the setpoint)
@@ -51,9 +82,12 @@ class PIDModelBeamSteering(PIDModelGeneric):
 #        key = list(measurements['Camera']['data2D'].keys())[0]  # so it can also be used from another plugin having another key
 #        image = measurements['Camera']['data2D'][key]['data']
         image = measurements[0].data[0]
-        image = image - self.settings.child('threshold').value()
-        image[image < 0] = 0
-        x, y = center_of_mass(image)
+        if self.settings.child('tracking').value():
+            x, y = self.tracker.locate(image, self.settings.child('threshold').value())
+            self.moments = self.tracker.moments
+        else:
+            self.moments = self.tracker.search(image, self.settings.child('threshold').value())
+            x, y = (np.nan, np.nan) if self.moments is None else self.moments.center
         self.curr_input = [y, x]
 #       return DataToExport('pid inputs',
 #                           data=[DataCalculated('pid calculated',
@@ -65,9 +99,13 @@ class PIDModelBeamSteering(PIDModelGeneric):
                                   DataCalculated('pid calculated',
                                                  data=[np.array([y])])])
 
+    @instrumented()
     def convert_output(self, outputs, dt, stab=True):
         """
         Convert the output of the PID in units to be fed into the actuator
+
+        The default clock of the mock controllers is stepped by dt (no effect on a real time clock)
+
         Parameters
         ----------
         output: (float) output value from the PID from which the model extract a value of the same units as the actuator
@@ -78,7 +116,8 @@ class PIDModelBeamSteering(PIDModelGeneric):
 
         """
         #print('output converted')
-        
+
+        get_default_clock().step(dt)
         self.curr_output = outputs
         return DataToActuatorPID('pid output', mode='rel',
                                  data=[DataActuator(self.actuators_name[ind],
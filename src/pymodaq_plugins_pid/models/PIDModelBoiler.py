@@ -1,5 +1,9 @@
+import numpy as np
 from pymodaq.extensions.pid.utils import PIDModelGeneric, DataToActuatorPID, main
-from pymodaq_data.data import DataToExport
+from pymodaq_data.data import DataToExport, DataCalculated
+from pymodaq.utils.data import DataActuator
+from pymodaq_plugins_pid.hardware.clock import get_default_clock
+from pymodaq_plugins_pid.utils.instrumentation import instrumented
 
 
 class PIDModelBoiler(PIDModelGeneric):
@@ -35,6 +39,7 @@ class PIDModelBoiler(PIDModelGeneric):
         self.pid_controller.modules_manager.get_mod_from_name('Thermometer', 'det').\
             settings.child('main_settings', 'wait_time').setValue(0)
 
+    @instrumented(advance=True)
     def convert_input(self, measurements):
         """
         Convert the measurements in the units to be fed to the PID (same dimensionality as the setpoint)
@@ -47,18 +52,23 @@ class PIDModelBoiler(PIDModelGeneric):
         float: the converted input
 
         """
-        self.curr_input = measurements['Thermometer']['data0D']['Thermometer_Boiler_CH000']['data']
+        self.curr_input = [float(measurements[0].data[0][0])]
 
         data = [DataCalculated('pid calculated',
-                               data=[np.array([self.curr_input])])]
-        return DataToExport('pid inputs', data=daza)
+                               data=[np.array(self.curr_input)])]
+        return DataToExport('pid inputs', data=data)
 
+    @instrumented()
     def convert_output(self, outputs, dt, stab=True):
         """
-
+        Convert the output of the PID into the heater power, the default clock of the mock controllers is stepped by
+        dt (no effect on a real time clock)
         """
+        get_default_clock().step(dt)
+        self.curr_output = outputs
         return DataToActuatorPID('pid output', mode='abs',
-                                 data=[outputs[0] / dt])
+                                 data=[DataActuator(self.actuators_name[0],
+                                                    data=outputs[0] / dt)])
 
 
 if __name__ == '__main__':
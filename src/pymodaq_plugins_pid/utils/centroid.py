@@ -0,0 +1,320 @@
+from collections import namedtuple
+
+import numpy as np
+
+_UNSET = object()
+_fused_moments = _UNSET
+
+
+def _build_fused_moments(numba):
+    @numba.njit(parallel=True, cache=True)
+    def fused_moments(image, threshold, r0, r1, c0, c1):
+        mass = 0.
+        sum_row = 0.
+        sum_col = 0.
+        sum_row2 = 0.
+        sum_col2 = 0.
+        sum_rowcol = 0.
+        for row in numba.prange(r0, r1):
+            row_mass = 0.
+            row_col = 0.
+            row_col2 = 0.
+            for col in range(c0, c1):
+                weight = image[row, col] - threshold
+                if weight > 0:
+                    row_mass += weight
+                    row_col += weight * col
+                    row_col2 += weight * col * col
+            mass += row_mass
+            sum_row += row_mass * row
+            sum_row2 += row_mass * row * row
+            sum_col += row_col
+            sum_col2 += row_col2
+            sum_rowcol += row_col * row
+        return mass, sum_row, sum_col, sum_row2, sum_col2, sum_rowcol
+
+    return fused_moments
+
+
+def get_fused_moments():
+    """ Get the fused (threshold, clip and moments in a single parallel pass) numba kernel
+
+    numba is only imported on the first call, the kernel being compiled on its first call for each image dtype and
+    layout (see MomentKernel.warm_up). The compiled kernels are cached on disk by numba, in the __pycache__ of this
+    package or, if it is not writable, in a user cache directory (NUMBA_CACHE_DIR overrides both).
+
+    Returns
+    -------
+    callable or None if numba is not installed
+    """
+    global _fused_moments
+    if _fused_moments is _UNSET:
+        try:
+            import numba
+        except ImportError:
+            _fused_moments = None
+        else:
+            _fused_moments = _build_fused_moments(numba)
+    return _fused_moments
+
+
+class Moments(namedtuple('Moments', ['mass', 'row', 'col', 'var_row', 'var_col', 'cov'])):
+    """ Moments of a thresholded image in image pixel coordinates
+
+    cov is the row/col covariance, nan if the second moments were not requested from the kernel
+    """
+
+    @property
+    def center(self):
+        return self.row, self.col
+
+    @property
+    def sigma(self):
+        return np.sqrt(max(self.var_row, 0.)), np.sqrt(max(self.var_col, 0.))
+
+    @property
+    def principal_sigmas(self):
+        """Standard deviations (major, minor) along the principal axes of the beam"""
+        mean = (self.var_row + self.var_col) / 2
+        delta = np.sqrt(((self.var_row - self.var_col) / 2) ** 2 + self.cov ** 2)
+        return np.sqrt(max(mean + delta, 0.)), np.sqrt(max(mean - delta, 0.))
+
+    @property
+    def ellipticity(self):
+        """Ratio of the minor to the major principal widths (1 for a round beam)"""
+        major, minor = self.principal_sigmas
+        return minor / major if major > 0 else np.nan
+
+
+class MomentKernel:
+    """ Moments of the part of an image above a threshold, computed without per call allocations
+
+    With the numpy backend, the thresholded image is written into a work buffer reused across calls and the sums
+    are matrix-vector products with cached coordinate (weight) vectors: row sums are img @ 1, column sums are
+    1 @ img and the first and second moments are dot products of these sums with the coordinates. The row/col
+    covariance needs one more product (img @ w_col) and is only computed if second_moments is True.
+
+    With the numba backend, threshold, clipping and all the moments are computed in a single parallel pass over the
+    image. The kernel is compiled for each new image dtype and layout, which takes about a second: call warm_up
+    before the first frames.
+
+    Parameters
+    ----------
+    second_moments: (bool) also compute the row/col covariance (beam orientation and ellipticity)
+    backend: (str) one of backends, 'auto' selects numba if it can be imported. If numba is requested but not
+        installed, the numpy backend is used
+    """
+    backends = ['auto', 'numpy', 'numba']
+    # pixel dtypes of the mock camera (BeamSteeringController.pixel_formats)
+    warm_up_dtypes = [np.float64, np.float32, np.uint8, np.uint16]
+
+    def __init__(self, second_moments=False, backend='numpy'):
+        self.second_moments = second_moments
+        self.backend = backend
+        self._shape = None
+
+    @property
+    def backend_used(self):
+        """The backend actually used, either 'numpy' or 'numba'"""
+        if self.backend != 'numpy' and get_fused_moments() is not None:
+            return 'numba'
+        return 'numpy'
+
+    def warm_up(self, dtypes=None):
+        """ Compile the numba kernel for contiguous and strided images of the given dtypes (warm_up_dtypes if None),
+        nothing is done with the numpy backend"""
+        if self.backend_used != 'numba':
+            return
+        kernel = get_fused_moments()
+        for dtype in self.warm_up_dtypes if dtypes is None else dtypes:
+            image = np.zeros((2, 4), dtype)
+            kernel(image, 0., 0, 2, 0, 4)
+            kernel(image[:, ::2], 0., 0, 2, 0, 2)
+
+    def _allocate(self, shape):
+        if shape != self._shape:
+            self._shape = shape
+            self._work = np.empty(shape)
+            self._row_coords = np.arange(shape[0], dtype=float)
+            self._col_coords = np.arange(shape[1], dtype=float)
+            self._row_coords2 = self._row_coords ** 2
+            self._col_coords2 = self._col_coords ** 2
+            self._row_ones = np.ones(shape[0])
+            self._col_ones = np.ones(shape[1])
+            self._row_sums = np.empty(shape[0])
+            self._col_sums = np.empty(shape[1])
+            self._cross = np.empty(shape[0])
+
+    def compute(self, image, threshold, rows=slice(None), cols=slice(None)):
+        """ Compute the moments of max(image - threshold, 0) in a window of the image
+
+        Parameters
+        ----------
+        image: (ndarray) 2D image
+        threshold: (float) value subtracted from the image, negative results are set to zero
+        rows: (slice) rows of the image to consider
+        cols: (slice) columns of the image to consider
+
+        Returns
+        -------
+        Moments or None if nothing is above threshold
+        """
+        threshold = float(threshold)  # an int threshold would make the subtraction wrap for unsigned frames
+        r0, r1, _ = rows.indices(image.shape[0])
+        c0, c1, _ = cols.indices(image.shape[1])
+        if self.backend_used == 'numba':
+            return self._compute_fused(image, threshold, r0, r1, c0, c1)
+
+        self._allocate(image.shape)
+        work = self._work[r0:r1, c0:c1]
+        np.subtract(image[r0:r1, c0:c1], threshold, out=work)
+        np.maximum(work, 0, out=work)
+
+        row_sums = np.matmul(work, self._col_ones[c0:c1], out=self._row_sums[:r1 - r0])
+        mass = row_sums.sum()
+        if mass <= 0:
+            return None
+        col_sums = np.matmul(self._row_ones[r0:r1], work, out=self._col_sums[:c1 - c0])
+
+        row = self._row_coords[r0:r1] @ row_sums / mass
+        col = self._col_coords[c0:c1] @ col_sums / mass
+        var_row = self._row_coords2[r0:r1] @ row_sums / mass - row ** 2
+        var_col = self._col_coords2[c0:c1] @ col_sums / mass - col ** 2
+        cov = np.nan
+        if self.second_moments:
+            cross = np.matmul(work, self._col_coords[c0:c1], out=self._cross[:r1 - r0])
+            cov = self._row_coords[r0:r1] @ cross / mass - row * col
+        return Moments(mass, row, col, var_row, var_col, cov)
+
+    def _compute_fused(self, image, threshold, r0, r1, c0, c1):
+        mass, sum_row, sum_col, sum_row2, sum_col2, sum_rowcol = \
+            get_fused_moments()(image, float(threshold), r0, r1, c0, c1)
+        if mass <= 0:
+            return None
+        row = sum_row / mass
+        col = sum_col / mass
+        return Moments(mass, row, col, sum_row2 / mass - row ** 2, sum_col2 / mass - col ** 2,
+                       sum_rowcol / mass - row * col if self.second_moments else np.nan)
+
+
+def block_sum(image, factor, out=None, work=None):
+    """ Sum the image over blocks of factor x factor pixels (the last rows/columns not filling a block are ignored)
+
+    The image is reshaped into (rows, factor, columns) and then (rows, columns, factor) views, so no copy is made:
+    the rows of each block are summed first (contiguous additions) into work, then the columns into out.
+
+    Parameters
+    ----------
+    image: (ndarray) 2D image
+    factor: (int) block size
+    out: (ndarray) optional float array of shape (rows // factor, columns // factor)
+    work: (ndarray) optional float array of shape (rows // factor, (columns // factor) * factor)
+    """
+    rows, cols = image.shape[0] // factor, image.shape[1] // factor
+    blocks = image[:rows * factor, :cols * factor].reshape((rows, factor, cols * factor))
+    if work is None:
+        work = np.empty((rows, cols * factor))
+    np.copyto(work, blocks[:, 0, :])
+    for ind in range(1, factor):
+        work += blocks[:, ind, :]
+    columns = work.reshape((rows, cols, factor))
+    if out is None:
+        out = np.empty((rows, cols))
+    np.copyto(out, columns[:, :, 0])
+    for ind in range(1, factor):
+        out += columns[:, :, ind]
+    return out
+
+
+class BeamTracker:
+    """ Track the centroid of a thresholded beam inside a window around its last position
+
+    The window half size along each axis is n_sigma times the measured beam width (at least min_half_size pixels).
+    The full frame is searched again when the lock is lost: nothing above threshold in the window or a centroid too
+    close to the window edges (the beam being partially out of the window).
+
+    With a pyramid factor larger than 1, the full frame search is coarse to fine: the beam is first located on the
+    frame block summed by this factor, then refined at full resolution in a window around the coarse estimate.
+
+    Parameters
+    ----------
+    n_sigma: (float) half size of the window in units of the measured beam standard deviation
+    min_half_size: (int) minimum half size of the window in pixels
+    kernel: (MomentKernel) kernel used to compute the moments, a new one if None
+    pyramid: (int) block size of the coarse search, 1 to search directly at full resolution
+    """
+    pyramids = [1, 2, 4, 8]
+
+    def __init__(self, n_sigma=4., min_half_size=8, kernel=None, pyramid=1):
+        self.n_sigma = n_sigma
+        self.min_half_size = min_half_size
+        self.kernel = MomentKernel() if kernel is None else kernel
+        self.pyramid = pyramid
+        self.moments = None
+        self.window = None
+        self._coarse_kernel = MomentKernel()
+        self._coarse = None
+
+    @property
+    def locked(self):
+        return self.moments is not None
+
+    def reset(self):
+        self.moments = None
+        self.window = None
+
+    def get_window(self, shape, center=None, sigma=None):
+        """Get the (rows, cols) slices of the tracking window around the last (or the given) centroid"""
+        if center is None:
+            center, sigma = self.moments.center, self.moments.sigma
+        window = []
+        for center, sigma, size in zip(center, sigma, shape):
+            half = max(self.n_sigma * sigma, self.min_half_size)
+            window.append(slice(int(max(np.floor(center - half), 0)), int(min(np.ceil(center + half) + 1, size))))
+        return tuple(window)
+
+    def _is_inside(self, moments, window, shape):
+        """Check the beam is not cut by a window edge that is not an image edge"""
+        for pos, sig, sl, size in zip(moments.center, moments.sigma, window, shape):
+            margin = max(sig, 1.)
+            if (sl.start > 0 and pos - margin < sl.start) or (sl.stop < size and pos + margin > sl.stop - 1):
+                return False
+        return True
+
+    def search(self, image, threshold):
+        """Locate the beam over the full frame"""
+        factor = self.pyramid
+        if factor > 1 and image.shape[0] >= factor and image.shape[1] >= factor:
+            shape = (image.shape[0] // factor, image.shape[1] // factor)
+            if self._coarse is None or self._coarse.shape != shape:
+                self._coarse = np.empty(shape)
+                self._coarse_work = np.empty((shape[0], shape[1] * factor))
+            self._coarse_kernel.backend = self.kernel.backend
+            coarse = self._coarse_kernel.compute(block_sum(image, factor, self._coarse, self._coarse_work),
+                                                 threshold * factor ** 2)
+            # a beam too narrow for its block sums to exceed the threshold is searched at full resolution
+            if coarse is not None:
+                # block (i, j) covers the full resolution pixels i * factor to (i + 1) * factor - 1
+                center = [(pos + 0.5) * factor - 0.5 for pos in coarse.center]
+                sigma = [max(sig * factor, factor) for sig in coarse.sigma]
+                window = self.get_window(image.shape, center, sigma)
+                moments = self.kernel.compute(image, threshold, *window)
+                if moments is not None and self._is_inside(moments, window, image.shape):
+                    return moments
+        return self.kernel.compute(image, threshold)
+
+    def locate(self, image, threshold):
+        """ Get the centroid (row, col) of the beam in image pixel coordinates, (nan, nan) if there is no beam"""
+        moments = None
+        if self.locked:
+            self.window = self.get_window(image.shape)
+            moments = self.kernel.compute(image, threshold, *self.window)
+            if moments is not None and not self._is_inside(moments, self.window, image.shape):
+                moments = None
+        if moments is None:
+            self.window = None
+            moments = self.search(image, threshold)
+        self.moments = moments
+        if moments is None:
+            return np.nan, np.nan
+        return moments.center
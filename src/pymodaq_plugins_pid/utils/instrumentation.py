@@ -0,0 +1,172 @@
+""" Latency instrumentation of the plugin and model hot paths
+
+The decorated methods (viewer grab_data, model convert_input/convert_output, actuator move_Abs/move_Rel) record
+the perf_counter (monotonic) timestamps of each call with an iteration id into the fixed size ring buffer of a
+LatencyProbe named after the method (for instance 'DAQ_2DViewer_BeamSteering.grab_data'). Rolling statistics of the
+last calls are available as a dict, a DataToExport or dumped to a json file.
+
+The iteration id is shared by all the probes, so that the stages of a PID iteration can be correlated: the model
+convert_input advances it (see next_iteration), convert_output and the moves of the iteration are recorded with the
+same id and the grabs with the id of the iteration their data feeds (the next one).
+
+Example
+-------
+>>> get_statistics()['PIDModelBeamSteering.convert_input']['p99']
+>>> dump('latencies.json')
+"""
+import functools
+import json
+from time import perf_counter
+
+import numpy as np
+
+_enabled = True
+_iteration = 0
+probes = {}
+
+
+class LatencyProbe:
+    """ Ring buffer of the (iteration id, start, stop) timestamps of the last calls of an instrumented function
+
+    Parameters
+    ----------
+    name: (str)
+    size: (int) number of calls kept
+    """
+
+    def __init__(self, name, size=1024):
+        self.name = name
+        self.size = size
+        self.count = 0
+        self._ids = np.zeros(size, dtype=np.int64)
+        self._starts = np.zeros(size)
+        self._stops = np.zeros(size)
+
+    def record(self, start, stop, iteration=None):
+        """Record a call, with the given iteration id or, if None, the number of calls recorded before"""
+        index = self.count % self.size
+        self._ids[index] = self.count if iteration is None else iteration
+        self._starts[index] = start
+        self._stops[index] = stop
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+    def get_samples(self):
+        """ Get the recorded calls in chronological order
+
+        Returns
+        -------
+        tuple of ndarray: iteration ids, start and stop timestamps in seconds
+        """
+        order = (np.arange(min(self.count, self.size)) + max(self.count - self.size, 0)) % self.size
+        return self._ids[order], self._starts[order], self._stops[order]
+
+    def get_statistics(self):
+        """ Statistics of the recorded calls (durations in seconds)
+
+        p50, p95 and p99 are percentiles of the latency, jitter its standard deviation, period the median interval
+        between successive calls and period_jitter the standard deviation of this interval
+        """
+        ids, starts, stops = self.get_samples()
+        latencies = stops - starts
+        statistics = dict(count=self.count, samples=len(ids))
+        if len(latencies):
+            statistics.update(zip(['p50', 'p95', 'p99'], np.percentile(latencies, [50, 95, 99]).tolist()),
+                              mean=float(latencies.mean()), max=float(latencies.max()),
+                              jitter=float(latencies.std()))
+        if len(starts) > 1:
+            periods = np.diff(starts)
+            statistics.update(period=float(np.median(periods)), period_jitter=float(periods.std()))
+        return statistics
+
+
+def next_iteration():
+    """Advance the shared iteration id and return it"""
+    global _iteration
+    _iteration += 1
+    return _iteration
+
+
+def get_iteration():
+    return _iteration
+
+
+def get_probe(name, size=1024):
+    """Get the probe of the given name, created if needed"""
+    if name not in probes:
+        probes[name] = LatencyProbe(name, size)
+    return probes[name]
+
+
+def enable(state=True):
+    """Switch on or off the recording of all the probes (an instrumented call then costs a flag test)"""
+    global _enabled
+    _enabled = state
+
+
+def is_enabled():
+    return _enabled
+
+
+def instrumented(name=None, size=1024, advance=False, offset=0):
+    """ Decorator recording the latency of each call of the decorated function into a probe
+
+    Parameters
+    ----------
+    name: (str) name of the probe, the qualified name of the function if None
+    size: (int) size of the ring buffer of the probe
+    advance: (bool) if True, each call starts a new iteration (see next_iteration)
+    offset: (int) offset of the recorded iteration id from the shared one, 1 for the calls feeding the next iteration
+    """
+    def decorator(func):
+        probe = get_probe(func.__qualname__ if name is None else name, size)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            iteration = (next_iteration() if advance else _iteration) + offset
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                probe.record(start, perf_counter(), iteration)
+        wrapper.probe = probe
+        return wrapper
+    return decorator
+
+
+def get_statistics(pattern=''):
+    """Get the statistics of the probes whose name contains pattern, as a dict of dict"""
+    return {name: probe.get_statistics() for name, probe in probes.items() if pattern in name and probe.count}
+
+
+def get_statistics_dte(pattern=''):
+    """ Get the latency statistics as a DataToExport, one DataCalculated per probe with the p50, p95, p99 and jitter
+    channels in seconds"""
+    from pymodaq_data.data import DataToExport, DataCalculated
+    channels = ['p50', 'p95', 'p99', 'jitter']
+    return DataToExport('latencies', data=[
+        DataCalculated(name, data=[np.array([statistics[channel]]) for channel in channels], labels=channels)
+        for name, statistics in get_statistics(pattern).items()])
+
+
+def dump(path, pattern='', samples=False):
+    """ Write the statistics (and optionally the recorded timestamps) of the probes into a json file"""
+    content = dict(statistics=get_statistics(pattern))
+    if samples:
+        content['samples'] = {name: dict(zip(['ids', 'starts', 'stops'], [array.tolist() for array in
+                                                                          probes[name].get_samples()]))
+                              for name in content['statistics']}
+    with open(path, 'w') as f:
+        json.dump(content, f, indent=2)
+
+
+def reset():
+    """Clear the recorded calls of all the probes and the iteration id"""
+    global _iteration
+    _iteration = 0
+    for probe in probes.values():
+        probe.reset()
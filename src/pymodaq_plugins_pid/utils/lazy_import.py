@@ -0,0 +1,45 @@
+import importlib
+
+
+def lazy_plugin_loader(package, plugins, logger_name):
+    """ Get the module __getattr__ and __dir__ of a plugin package importing its plugin modules on first access
+
+    Parameters
+    ----------
+    package: (str) name of the plugin package
+    plugins: (dict) static manifest of the package, plugin module name: plugin class name
+    logger_name: (str) name of the logger warning about a plugin that could not be imported
+
+    Returns
+    -------
+    tuple of callable: __getattr__ and __dir__ of the package, attributes being either a plugin module or a plugin
+        class
+    """
+    classes = {class_name: module_name for module_name, class_name in plugins.items()}
+
+    def warn(module_name, error):
+        try:
+            from pymodaq_utils.logger import set_logger
+        except ImportError:
+            return
+        set_logger(logger_name, add_to_console=False).warning(
+            "{:} plugin couldn't be loaded due to some missing packages or errors: {:}".format(module_name, str(error)))
+
+    def import_plugin(module_name):
+        try:
+            return importlib.import_module('.' + module_name, package)
+        except Exception as e:
+            warn(module_name, e)
+            raise
+
+    def __getattr__(name):
+        if name in plugins:
+            return import_plugin(name)
+        if name in classes:
+            return getattr(import_plugin(classes[name]), name)
+        raise AttributeError(f'module {package!r} has no attribute {name!r}')
+
+    def __dir__():
+        return sorted(list(plugins) + list(classes))
+
+    return __getattr__, __dir__
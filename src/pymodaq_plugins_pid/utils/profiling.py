@@ -0,0 +1,203 @@
+""" In-process profiling of the next calls of plugin hot paths (grab_data, move_Abs...)
+
+A PluginProfiler only wraps the profiled methods (as instance attributes shadowing the class methods) while a
+profiling session is running, so it adds no overhead the rest of the time. A session profiles the next N calls with
+either cProfile (a .pstats file, see pstats or snakeviz) or a sampling profiler (a .folded file of collapsed stacks,
+the input of flamegraph.pl or speedscope), then writes the output and switches itself off.
+
+From python 3.12, a single cProfile session can be enabled at a time in a process: a plugin whose cProfile session
+cannot be enabled (another plugin, in its own thread, is being profiled with cProfile) falls back to the sampling
+profiler.
+"""
+from collections import Counter
+import cProfile
+import functools
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+def get_profile_params():
+    """Get the params of the profile group to add to a plugin params"""
+    return {'title': 'Profile:', 'name': 'profile', 'type': 'group', 'expanded': False, 'children': [
+        {'title': 'Start:', 'name': 'profile_on', 'type': 'bool', 'value': False,
+         'tip': 'Profile the next calls, switched off once done'},
+        {'title': 'Profiler:', 'name': 'profiler', 'type': 'list', 'value': 'cProfile',
+         'limits': PluginProfiler.profilers},
+        {'title': 'Calls:', 'name': 'profile_calls', 'type': 'int', 'value': 100, 'min': 1},
+        {'title': 'Directory:', 'name': 'profile_directory', 'type': 'browsepath', 'value': tempfile.gettempdir(),
+         'filetype': False},
+    ]}
+
+
+class SamplingProfiler:
+    """ Sample from a thread the call stacks of the profiled calls every interval seconds
+
+    Parameters
+    ----------
+    interval: (float) sampling period in seconds
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.stacks = Counter()
+        self._target = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def enable(self):
+        """Sample the calling thread until disable is called"""
+        self._target = threading.get_ident()
+
+    def disable(self):
+        self._target = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            target = self._target
+            frame = None if target is None else sys._current_frames().get(target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def dump_stats(self, path):
+        """Write the collapsed stacks, one 'caller;...;callee count' line per stack"""
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+class PluginProfiler:
+    """ Profile the next calls of some methods of a plugin
+
+    Parameters
+    ----------
+    plugin: (object) instance whose methods are profiled
+    methods: (list of str) names of the profiled methods, the calls of all of them are counted together
+    settings: (Parameter) optional profile group (see get_profile_params) driving the profiler through update
+    """
+    profilers = ['cProfile', 'sampling']
+    extensions = {'cProfile': '.pstats', 'sampling': '.folded'}
+
+    def __init__(self, plugin, methods, settings=None):
+        self.plugin = plugin
+        self.methods = methods
+        self.settings = settings
+        self.path = None
+        self._profiler = None
+        self._remaining = 0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self._profiler is not None
+
+    def update(self):
+        """Start or stop the profiling from the settings"""
+        if self.settings.child('profile_on').value():
+            if not self.active:
+                self.start(self.settings.child('profile_calls').value(),
+                           self.settings.child('profile_directory').value(),
+                           self.settings.child('profiler').value())
+        else:
+            self.stop()
+
+    def start(self, n_calls=100, directory=None, profiler='cProfile'):
+        """ Profile the next n_calls calls
+
+        Parameters
+        ----------
+        n_calls: (int)
+        directory: (str) where to write the output, the temporary directory if None
+        profiler: (str) one of profilers
+        """
+        self.stop()
+        directory = Path(tempfile.gettempdir() if directory is None else directory)
+        self.path = directory.joinpath(f"{type(self.plugin).__name__}_{datetime.now():%Y%m%d_%H%M%S_%f}"
+                                       f"{self.extensions[profiler]}")
+        self._profiler = cProfile.Profile() if profiler == 'cProfile' else SamplingProfiler()
+        if profiler == 'sampling':
+            self._profiler.start()
+        self._remaining = n_calls
+        for name in self.methods:
+            setattr(self.plugin, name, self._wrap(getattr(self.plugin, name)))
+
+    def _enable(self, profiler):
+        """ Enable profiler, or the sampling profiler replacing it if another cProfile session is active
+
+        Returns
+        -------
+        the enabled profiler, None if the session was stopped meanwhile
+        """
+        try:
+            profiler.enable()
+            return profiler
+        except ValueError:  # python >= 3.12: 'Another profiling tool is already active'
+            pass
+        with self._lock:
+            if self._profiler is profiler:
+                self._profiler = SamplingProfiler()
+                self._profiler.start()
+                self.path = self.path.with_suffix(self.extensions['sampling'])
+            profiler = self._profiler
+        if profiler is not None:
+            profiler.enable()
+        return profiler
+
+    def _wrap(self, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            profiler = self._profiler
+            if profiler is None:
+                return method(*args, **kwargs)
+            try:
+                profiler = self._enable(profiler)
+                return method(*args, **kwargs)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                with self._lock:
+                    self._remaining -= 1
+                    done = self._remaining == 0
+                if done:
+                    self.stop()
+        return wrapper
+
+    def stop(self):
+        """ Stop the profiling and write its output
+
+        Returns
+        -------
+        Path: the written file, None if nothing was profiled
+        """
+        with self._lock:
+            profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return None
+        for name in self.methods:
+            self.plugin.__dict__.pop(name, None)
+        if isinstance(profiler, SamplingProfiler):
+            profiler.stop()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(self.path))
+        if self.settings is not None and self.settings.child('profile_on').value():
+            self.settings.child('profile_on').setValue(False)
+        return self.path
@@ -0,0 +1,263 @@
+""" Headless closed loop simulation of the PID models against the mock controllers
+
+The measurements of the mock controllers are fed to the model convert_input, a plain PID computes the outputs, and
+the model convert_output drives the mock actuators, in a tight loop without Qt event loop, GUI nor preset. Time is
+given by a SteppedClock advanced by dt at each iteration, so the loop runs as fast as the CPU allows. pymodaq is only
+imported when a simulation runs, the PID and get_step_response helpers (used by the tuning worker processes) only
+need numpy.
+
+Example
+-------
+>>> result = simulate_boiler(2000, dt=0.1, konstants=dict(kp=0.05, ki=0.02, kd=0.))
+>>> result.settling_time, result.overshoot, result.iterations_per_second
+"""
+from collections import namedtuple
+from time import perf_counter
+
+import numpy as np
+
+from pymodaq_plugins_pid.hardware.clock import SteppedClock, get_default_clock, set_default_clock
+from pymodaq_plugins_pid.hardware.boiler_core import BoilerCore
+from pymodaq_plugins_pid.hardware.beamsteering import BeamSteeringController
+
+
+class _Parameter:
+    """ Minimal stand-in of a pyqtgraph Parameter (name, value, children) built from a params list of dict"""
+
+    def __init__(self, opts, parent=None):
+        self._name = opts['name']
+        self._value = opts.get('value')
+        self._parent = parent
+        self._children = [_Parameter(child, self) for child in opts.get('children', [])]
+
+    def name(self):
+        return self._name
+
+    def value(self):
+        return self._value
+
+    def setValue(self, value):
+        self._value = value
+
+    def parent(self):
+        return self._parent
+
+    def children(self):
+        return self._children
+
+    def child(self, *names):
+        param = self
+        for name in names:
+            param = next(child for child in param.children() if child.name() == name)
+        return param
+
+
+class _ModulesManager:
+    """ Stand-in of the modules manager, with the module names expected by the model but no module"""
+
+    def __init__(self, actuators_name, detectors_name):
+        self.actuators_name = list(actuators_name)
+        self.detectors_name = list(detectors_name)
+
+    def get_mod_from_name(self, name, mod='act'):
+        return None
+
+
+class PIDControllerStandIn:
+    """ What a PID model needs from the DAQ_PID extension: its settings and a modules manager
+
+    Parameters
+    ----------
+    model_class: (type) subclass of PIDModelGeneric
+    settings: (dict) values of the model params overriding their defaults
+    """
+
+    def __init__(self, model_class, settings=None):
+        settings = {} if settings is None else settings
+        model_params = [dict(param, value=settings.get(param['name'], param.get('value')))
+                        for param in model_class.params]
+        self.settings = _Parameter(dict(name='settings', children=[
+            dict(name='models', children=[dict(name='model_params', children=model_params)])]))
+        self.modules_manager = _ModulesManager(model_class.actuators_name, model_class.detectors_name)
+
+
+class PID:
+    """ Vectorized PID (same conventions as simple_pid used by the PID extension)
+
+    The integral term and the output are clipped to the output limits, the derivative is computed on the input to
+    avoid kicks on setpoint changes. A nan input (nothing detected) gives a zero error.
+
+    Parameters
+    ----------
+    kp, ki, kd: (float) gains
+    setpoints: (list of float)
+    output_limits: (tuple) (min, max) of the outputs, None for no limit
+    """
+
+    def __init__(self, kp, ki, kd, setpoints, output_limits=(None, None)):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.setpoints = np.asarray(setpoints, dtype=float)
+        self.output_limits = output_limits
+        self.reset()
+
+    def reset(self):
+        self._integral = np.zeros(self.setpoints.shape)
+        self._last_input = None
+
+    def _clip(self, values):
+        low, high = self.output_limits
+        return np.clip(values, -np.inf if low is None else low, np.inf if high is None else high)
+
+    def __call__(self, inputs, dt):
+        inputs = np.asarray(inputs, dtype=float)
+        error = np.where(np.isnan(inputs), 0., self.setpoints - inputs)
+        self._integral = self._clip(self._integral + self.ki * error * dt)
+        derivative = 0. if self._last_input is None else \
+            -self.kd * np.nan_to_num(inputs - self._last_input) / dt
+        self._last_input = inputs
+        return self._clip(self.kp * error + self._integral + derivative)
+
+
+class BoilerPlant:
+    """ Mock boiler seen as the Heater actuator and the Thermometer detector of PIDModelBoiler"""
+    model_name = 'PIDModelBoiler'
+
+    def __init__(self, clock, seed=None, **kwargs):
+        self.controller = BoilerCore(seed, clock=clock, **kwargs)
+
+    def grab(self):
+        from pymodaq_data.data import DataToExport, DataRaw
+        return DataToExport('Thermometer', data=[DataRaw('Boiler', data=[np.array([self.controller.grab()])])])
+
+    def move(self, actuator, value, mode='abs'):
+        if mode == 'abs':
+            self.controller.move_abs(value)
+        else:
+            self.controller.move_rel(value)
+
+
+class BeamSteeringPlant:
+    """ Mock beam steering seen as the Xpiezo/Ypiezo actuators and the Camera detector of PIDModelBeamSteering
+
+    The model inputs are (row, column) of the beam on the camera, so Xpiezo drives the V axis and Ypiezo the H axis
+    """
+    model_name = 'PIDModelBeamSteering'
+    actuators = {'Xpiezo': 'V', 'Ypiezo': 'H'}
+
+    def __init__(self, clock, seed=None, **kwargs):
+        self.controller = BeamSteeringController(seed=seed, clock=clock, **kwargs)
+
+    def grab(self):
+        from pymodaq_data.data import DataToExport, DataRaw
+        image = self.controller.get_data_output(data_dim='2D')
+        return DataToExport('Camera', data=[DataRaw('Mock2DPID', data=[image])])
+
+    def move(self, actuator, value, mode='rel'):
+        if mode == 'abs':
+            self.controller.move_abs(value, self.actuators[actuator])
+        else:
+            self.controller.move_rel(value, self.actuators[actuator])
+
+
+SimulationResult = namedtuple('SimulationResult', ['times', 'inputs', 'outputs', 'setpoints', 'settling_time',
+                                                   'overshoot', 'steady_state_error', 'iterations_per_second'])
+SimulationResult.__doc__ = """ Traces and figures of merit of a closed loop simulation
+
+times, inputs and outputs are the traces (one row per iteration, one column per setpoint), settling_time,
+overshoot (relative to the step) and steady_state_error are arrays with one value per setpoint"""
+
+
+def get_step_response(times, inputs, setpoints, tolerance=0.02, tail=0.1):
+    """ Figures of merit of the response of each setpoint channel (and of each candidate, see tuning)
+
+    Parameters
+    ----------
+    times: (ndarray) times of the N iterations
+    inputs: (ndarray) (N, ...) inputs of the PID, for instance (N, Nsetpoints)
+    setpoints: (ndarray) setpoints broadcastable to inputs[0]
+    tolerance: (float) band around the setpoint, relative to the step, used for the settling time
+    tail: (float) fraction of the last iterations used for the steady state error
+
+    Returns
+    -------
+    tuple of ndarray: settling_time (nan if never settled), overshoot, steady_state_error
+    """
+    inputs = np.asarray(inputs, dtype=float)
+    step = setpoints - inputs[0]
+    deviation = inputs - setpoints
+    outside = np.abs(deviation) > np.maximum(tolerance * np.abs(step), np.finfo(float).eps)
+    outside |= np.isnan(deviation)
+    # first iteration after which the input stays in the band
+    settled = np.where(outside.any(axis=0), len(times) - np.argmax(outside[::-1], axis=0), 0)
+    settling_time = np.where(settled < len(times), times[np.minimum(settled, len(times) - 1)] - times[0], np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        overshoot = np.nanmax(np.maximum(np.sign(step) * deviation, 0.), axis=0) / np.abs(step)
+    steady_state_error = np.nanmean(np.abs(deviation[-max(int(tail * len(times)), 1):]), axis=0)
+    return settling_time, overshoot, steady_state_error
+
+
+def simulate(model_class, plant, n_iterations=1000, dt=0.1, setpoints=None, konstants=None, settings=None,
+             tolerance=0.02, tail=0.1):
+    """ Run a PID model in closed loop against a mock plant
+
+    Parameters
+    ----------
+    model_class: (type) subclass of PIDModelGeneric
+    plant: (BoilerPlant or BeamSteeringPlant) plant built on a SteppedClock (see simulate_boiler)
+    n_iterations: (int) number of PID iterations
+    dt: (float) PID period in seconds of the plant clock
+    setpoints: (list of float) setpoints, the model setpoint_ini if None
+    konstants: (dict) kp, ki and kd, the model konstants if None
+    settings: (dict) values of the model params overriding their defaults
+    tolerance: (float) see get_step_response
+    tail: (float) see get_step_response
+
+    Returns
+    -------
+    SimulationResult
+    """
+    model = model_class(PIDControllerStandIn(model_class, settings))
+    setpoints = np.asarray(model_class.setpoint_ini if setpoints is None else setpoints, dtype=float)
+    konstants = dict(model_class.konstants, **({} if konstants is None else konstants))
+    limits = [model_class.limits[key]['value'] if model_class.limits[key]['state'] else None for key in ['min', 'max']]
+    pid = PID(konstants['kp'], konstants['ki'], konstants['kd'], setpoints, tuple(limits))
+
+    clock = plant.controller.clock
+    previous_clock = get_default_clock()
+    set_default_clock(clock)
+    times = np.empty(n_iterations)
+    inputs = np.empty((n_iterations, len(setpoints)))
+    outputs = np.empty((n_iterations, len(setpoints)))
+    try:
+        start = perf_counter()
+        for ind in range(n_iterations):
+            times[ind] = clock.now()
+            converted = model.convert_input(plant.grab())
+            inputs[ind] = [np.asarray(dat.data[0]).item() for dat in converted.data]
+            outputs[ind] = pid(inputs[ind], dt)
+            to_actuators = model.convert_output(list(outputs[ind]), dt)
+            if clock.now() == times[ind]:  # the model did not step the clock
+                clock.step(dt)
+            for name, dat in zip(model_class.actuators_name, to_actuators.data):
+                plant.move(name, np.asarray(dat.data[0]).item(), to_actuators.mode)
+        elapsed = perf_counter() - start
+    finally:
+        set_default_clock(previous_clock)
+
+    settling_time, overshoot, steady_state_error = get_step_response(times, inputs, setpoints, tolerance, tail)
+    return SimulationResult(times, inputs, outputs, setpoints, settling_time, overshoot, steady_state_error,
+                            n_iterations / elapsed if elapsed > 0 else np.inf)
+
+
+def simulate_boiler(n_iterations=1000, dt=0.1, seed=None, **kwargs):
+    """ Closed loop simulation of PIDModelBoiler, see simulate for the keyword arguments"""
+    from pymodaq_plugins_pid.models.PIDModelBoiler import PIDModelBoiler
+    return simulate(PIDModelBoiler, BoilerPlant(SteppedClock(), seed), n_iterations, dt, **kwargs)
+
+
+def simulate_beam_steering(n_iterations=100, dt=0.1, seed=None, **kwargs):
+    """ Closed loop simulation of PIDModelBeamSteering, see simulate for the keyword arguments"""
+    from pymodaq_plugins_pid.models.PIDModelBeamSteering import PIDModelBeamSteering
+    return simulate(PIDModelBeamSteering, BeamSteeringPlant(SteppedClock(), seed), n_iterations, dt, **kwargs)
@@ -0,0 +1,196 @@
+""" Batch tuning of the PID gains on simulated plants
+
+A whole grid of (kp, ki, kd) candidates is simulated at once: the plant state holds one row per candidate and all
+the candidates are stepped together by the vectorized PID of utils.simulation. The candidates can also be sharded
+over a pool of processes. All the candidates see the same noise realization (common random numbers), drawn from the
+seed: the comparison of the candidates is not blurred by the noise and the results do not depend on the sharding.
+
+Example
+-------
+>>> result = tune_boiler(kp=np.linspace(0.001, 0.05, 20), ki=np.linspace(0, 0.05, 20), kd=[0.])
+>>> result.best, result.itae.shape
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pymodaq_plugins_pid.hardware.clock import SteppedClock
+from pymodaq_plugins_pid.hardware.boiler_core import BoilerBankCore
+from pymodaq_plugins_pid.hardware.beamsteering import BeamSteeringController
+from pymodaq_plugins_pid.utils.simulation import PID, get_step_response
+
+
+class CommonNoise:
+    """ Noise source of the batch plants drawing a single value per call, shared by all the candidates"""
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def standard_normal(self, size=None):
+        return np.full(size, self.rng.standard_normal())
+
+
+class BoilerBatch:
+    """ Independent boilers, one per candidate, as zones of an uncoupled BoilerBankCore
+
+    The PID output is converted as in PIDModelBoiler: the heater power is output / dt
+    """
+    output_limits = (None, None)
+    setpoint_ini = [25.]
+
+    def __init__(self, n_candidates, seed=None, **kwargs):
+        self.clock = SteppedClock()
+        self.core = BoilerBankCore(n_candidates, clock=self.clock, **kwargs)
+        self.core.noise_generator = CommonNoise(seed)
+
+    def measure(self):
+        """Inputs of the PID, (n_candidates, 1) array"""
+        return self.core.grab()[:, None]
+
+    def actuate(self, outputs, dt):
+        self.core.set_powers(outputs[:, 0] / dt)
+
+
+class BeamSteeringBatch:
+    """ Beam steering setups, one per candidate, with the camera reduced to the beam center and a centroid noise
+
+    Rendering and centroiding a frame per candidate would dominate the run time, so the measured (row, column) of the
+    beam is its true center (see BeamSteeringController.get_beam_center) plus a gaussian noise. The PID outputs are
+    relative moves of the V (rows) and H (columns) axes as in PIDModelBeamSteering.
+
+    Parameters
+    ----------
+    n_candidates: (int)
+    seed: (int) seed of the centroid noise, the same for all the candidates
+    centroid_noise: (float) standard deviation in pixels of the measured centroid
+    """
+    output_limits = (-100, 100)
+    setpoint_ini = [100., 150.]
+
+    def __init__(self, n_candidates, seed=None, centroid_noise=0.05):
+        self.clock = SteppedClock()
+        self.rng = np.random.default_rng(seed)
+        self.centroid_noise = centroid_noise
+        self.offsets = np.array([BeamSteeringController.offset_y, BeamSteeringController.offset_x])
+        self.positions = np.zeros((n_candidates, 2))  # (V, H) positions of the actuators
+
+    def measure(self):
+        inputs = self.offsets + BeamSteeringController.coeff * self.positions
+        inputs += self.centroid_noise * self.rng.standard_normal(inputs.shape[-1])
+        return inputs
+
+    def actuate(self, outputs, dt):
+        self.positions += outputs
+
+
+plants = {'PIDModelBoiler': BoilerBatch, 'PIDModelBeamSteering': BeamSteeringBatch}
+
+
+def simulate_batch(plant_name, gains, setpoints=None, n_iterations=1000, dt=0.1, seed=None, tolerance=0.02,
+                   tail=0.1):
+    """ Simulate in closed loop one plant per set of gains, all stepped together
+
+    Parameters
+    ----------
+    plant_name: (str) one of the keys of plants
+    gains: (ndarray) (n_candidates, 3) array of (kp, ki, kd)
+    setpoints: (list of float) setpoints, the plant setpoint_ini if None
+    n_iterations: (int) number of PID iterations
+    dt: (float) PID period in seconds
+    seed: (int) seed of the plant noise, the same noise realization being applied to all the candidates
+    tolerance: (float) see simulation.get_step_response
+    tail: (float) see simulation.get_step_response
+
+    Returns
+    -------
+    dict of (n_candidates,) arrays: itae, overshoot, settling_time and steady_state_error, the worst over the
+    setpoints
+    """
+    plant_class = plants[plant_name]
+    gains = np.asarray(gains, dtype=float)
+    plant = plant_class(len(gains), seed)
+    setpoints = np.asarray(plant_class.setpoint_ini if setpoints is None else setpoints, dtype=float)
+    pid = PID(gains[:, 0:1], gains[:, 1:2], gains[:, 2:3], np.broadcast_to(setpoints, (len(gains), len(setpoints))),
+              plant_class.output_limits)
+
+    times = np.empty(n_iterations)
+    inputs = np.empty((n_iterations, len(gains), len(setpoints)))
+    for ind in range(n_iterations):
+        times[ind] = plant.clock.now()
+        inputs[ind] = plant.measure()
+        plant.actuate(pid(inputs[ind], dt), dt)
+        plant.clock.step(dt)
+
+    with np.errstate(invalid='ignore'):
+        settling_time, overshoot, steady_state_error = get_step_response(times, inputs, setpoints, tolerance, tail)
+    errors = np.nan_to_num(np.abs(inputs - setpoints), nan=np.inf)
+    itae = np.sum((times - times[0])[:, None, None] * errors * dt, axis=0)
+    return dict(itae=itae.max(axis=-1),
+                overshoot=np.nan_to_num(overshoot, nan=0.).max(axis=-1),
+                settling_time=np.nan_to_num(settling_time, nan=np.inf).max(axis=-1),
+                steady_state_error=steady_state_error.max(axis=-1))
+
+
+TuningResult = namedtuple('TuningResult', ['kp', 'ki', 'kd', 'itae', 'overshoot', 'settling_time',
+                                           'steady_state_error', 'best'])
+TuningResult.__doc__ = """ Cost surfaces over the (kp, ki, kd) grid
+
+itae, overshoot, settling_time (inf if never settled) and steady_state_error have the shape (len(kp), len(ki),
+len(kd)), best is a dict of the gains (kp, ki, kd) minimizing the objective"""
+
+
+def tune(plant_name, kp, ki, kd, setpoints=None, n_iterations=1000, dt=0.1, objective='itae', max_overshoot=None,
+         seed=None, n_workers=1, tolerance=0.02, tail=0.1):
+    """ Simulate the grid of gains kp x ki x kd and find the best gains
+
+    Parameters
+    ----------
+    plant_name: (str) one of the keys of plants
+    kp, ki, kd: (list of float) values of each gain in the grid
+    setpoints: (list of float) setpoints, the plant setpoint_ini if None
+    n_iterations: (int) number of PID iterations
+    dt: (float) PID period in seconds
+    objective: (str) figure to minimize, one of 'itae', 'overshoot', 'settling_time' or 'steady_state_error'
+    max_overshoot: (float) if not None, candidates with a larger relative overshoot are not considered as best
+    seed: (int) seed of the plant noise
+    n_workers: (int) number of processes the candidates are sharded over, 1 to run in this process
+    tolerance: (float) see simulation.get_step_response
+    tail: (float) see simulation.get_step_response
+
+    Returns
+    -------
+    TuningResult
+    """
+    kp, ki, kd = [np.atleast_1d(np.asarray(gain, dtype=float)) for gain in (kp, ki, kd)]
+    grid = np.stack([gain.ravel() for gain in np.meshgrid(kp, ki, kd, indexing='ij')], axis=-1)
+    # a drawn seed if None, shared by the shards
+    seed = int(np.random.SeedSequence(seed).generate_state(1)[0])
+    shards = np.array_split(grid, max(n_workers, 1))
+
+    args = (setpoints, n_iterations, dt)
+    if n_workers > 1:
+        with ProcessPoolExecutor(n_workers) as executor:
+            futures = [executor.submit(simulate_batch, plant_name, shard, *args, seed, tolerance, tail)
+                       for shard in shards if len(shard)]
+            results = [future.result() for future in futures]
+    else:
+        results = [simulate_batch(plant_name, grid, *args, seed, tolerance, tail)]
+
+    surfaces = {key: np.concatenate([result[key] for result in results]).reshape((len(kp), len(ki), len(kd)))
+                for key in results[0]}
+    cost = surfaces[objective].copy()
+    if max_overshoot is not None:
+        cost[surfaces['overshoot'] > max_overshoot] = np.inf
+    best = grid[np.argmin(cost)]
+    return TuningResult(kp, ki, kd, best=dict(kp=float(best[0]), ki=float(best[1]), kd=float(best[2])), **surfaces)
+
+
+def tune_boiler(kp, ki, kd, **kwargs):
+    """ Tune the gains of PIDModelBoiler, see tune for the keyword arguments"""
+    return tune('PIDModelBoiler', kp, ki, kd, **kwargs)
+
+
+def tune_beam_steering(kp, ki, kd, **kwargs):
+    """ Tune the gains of PIDModelBeamSteering, see tune for the keyword arguments"""
+    return tune('PIDModelBeamSteering', kp, ki, kd, **kwargs)